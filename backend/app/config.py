@@ -18,6 +18,15 @@ class Settings(BaseSettings):
 
     # Database (Neon PostgreSQL)
     DATABASE_URL: str
+    DB_POOL_SIZE: int = 20
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_RECYCLE: int = 1800  # seconds — recycle before Neon drops idle conns
+    DB_STATEMENT_CACHE_SIZE: int = 1024  # asyncpg prepared statements per connection
+    DB_USE_PGBOUNCER: bool = False  # True when DATABASE_URL points at a transaction-mode pooler
+    DB_QUERY_CACHE_SIZE: int = 1200  # SQLAlchemy compiled-statement cache (default 500)
+
+    # Cache — Redis when set, otherwise in-process (single instance)
+    REDIS_URL: str = ""
 
     # TMDB
     TMDB_API_KEY: str = ""
@@ -5,16 +5,37 @@ Async SQLAlchemy 2.0 with Neon PostgreSQL.
 
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
 from sqlalchemy.orm import DeclarativeBase
+from sqlalchemy.pool import NullPool
 from app.config import get_settings
 
 settings = get_settings()
 
+# Each list request holds its connection across several awaits, so the
+# default pool of 5 starves under ~20 concurrent requests (shows up as
+# latency spikes, not errors). Behind PgBouncer in transaction mode the
+# pooler does the multiplexing — use NullPool and disable asyncpg's
+# prepared statement cache, which transaction pooling can't support.
+if settings.DB_USE_PGBOUNCER:
+    _pool_kwargs = {
+        "poolclass": NullPool,
+        "connect_args": {"statement_cache_size": 0},
+    }
+else:
+    _pool_kwargs = {
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_pre_ping": True,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "connect_args": {"statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE},
+    }
+
 engine = create_async_engine(
     settings.DATABASE_URL,
     echo=settings.DEBUG,
-    pool_size=5,
-    max_overflow=10,
-    pool_pre_ping=True,
+    # Category/mood/verdict combinations produce more distinct statement
+    # shapes than the default 500-entry compiled cache holds
+    query_cache_size=settings.DB_QUERY_CACHE_SIZE,
+    **_pool_kwargs,
 )
 
 async_session = async_sessionmaker(
@@ -0,0 +1,66 @@
+"""
+Worth the Watch? — Battle Prewarm Job
+Generates Versus battles between the most popular reviewed titles ahead of
+time, so the matchups people actually pick are already in BattleCache.
+Called by external cron hitting POST /api/cron/battles.
+"""
+
+import logging
+from itertools import combinations
+from sqlalchemy import select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import Movie, Review, BattleCache
+from app.routers.versus import run_battle
+
+logger = logging.getLogger(__name__)
+
+
+async def prewarm_popular_battles(db: AsyncSession, top_n: int = 15, max_new: int = 30):
+    """
+    Battle every pair among the top_n most popular reviewed titles that isn't
+    cached yet, up to max_new new battles per run (each one is an LLM call).
+    Runs sequentially so a run never competes with user traffic for the LLM.
+    """
+    logger.info("⚔️ Starting battle prewarm...")
+
+    result = await db.execute(
+        select(Movie.tmdb_id, Movie.media_type, Movie.title)
+        .join(Review, Review.movie_id == Movie.id)
+        .order_by(Movie.tmdb_popularity.desc().nulls_last())
+        .limit(top_n)
+    )
+    titles = result.all()
+
+    pairs = [
+        (a, b) if a.tmdb_id < b.tmdb_id else (b, a)
+        for a, b in combinations(titles, 2)
+    ]
+    if not pairs:
+        return {"generated": 0, "failed": 0, "already_cached": 0}
+
+    cached = await db.execute(
+        select(BattleCache.movie_a_id, BattleCache.movie_b_id).where(
+            tuple_(BattleCache.movie_a_id, BattleCache.movie_b_id).in_(
+                [(a.tmdb_id, b.tmdb_id) for a, b in pairs]
+            )
+        )
+    )
+    cached_pairs = set(cached.tuples())
+    todo = [(a, b) for a, b in pairs if (a.tmdb_id, b.tmdb_id) not in cached_pairs][:max_new]
+    # The LLM calls below take a while; don't sit on a pooled connection meanwhile
+    await db.close()
+
+    generated = 0
+    failed = 0
+    for a, b in todo:
+        try:
+            await run_battle(a.tmdb_id, a.media_type, b.tmdb_id, b.media_type)
+            generated += 1
+            logger.info(f"  ⚔️ Prewarmed: {a.title} vs {b.title}")
+        except Exception as e:
+            failed += 1
+            logger.error(f"  ❌ Prewarm failed for {a.title} vs {b.title}: {e}")
+
+    logger.info(f"🏁 Battle prewarm complete: {generated} generated, {failed} failed")
+    return {"generated": generated, "failed": failed, "already_cached": len(cached_pairs)}
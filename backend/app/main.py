@@ -18,6 +18,9 @@ from app.database import init_db, get_db
 from app.models import Movie, Review, SearchEvent  # noqa: F401
 from app.routers import movies, search, versus, nowplaying, discover
 from app.jobs.daily_sync import run_daily_sync
+from app.services.cache import cache_service
+from app.services.search_events import search_event_logger
+from app.responses import ORJSONResponse
 from app.schemas import HealthCheck
 
 settings = get_settings()
@@ -39,6 +42,8 @@ async def lifespan(app: FastAPI):
     logger.info("🎬 Worth the Watch? — Starting up...")
     await init_db()
     logger.info("✅ Database initialized")
+    await cache_service.connect()
+    search_event_logger.start()
     
     from app.services.tmdb import tmdb_service
     import asyncio
@@ -46,6 +51,9 @@ async def lifespan(app: FastAPI):
     
     yield
     logger.info("👋 Shutting down...")
+    await search_event_logger.stop()
+    await tmdb_service.aclose()
+    await cache_service.close()
 
 
 # ─── App ──────────────────────────────────────────────────
@@ -55,6 +63,7 @@ app = FastAPI(
     description="AI-powered movie review aggregation. The internet decides.",
     version="1.0.0",
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
     docs_url="/docs" if settings.ENVIRONMENT == "development" else None,
     redoc_url="/redoc" if settings.ENVIRONMENT == "development" else None,
     openapi_url="/openapi.json" if settings.ENVIRONMENT == "development" else None,
@@ -218,6 +227,35 @@ async def _refresh_background(max_refresh: int):
             logger.error(f"❌ Manual refresh failed: {e}")
 
 
+@app.post("/api/cron/battles")
+async def cron_battles(
+    secret: str = "",
+    top_n: int = 15,
+    max_new: int = 30,
+    background_tasks: BackgroundTasks = None,
+):
+    if not secrets.compare_digest(secret, settings.CRON_SECRET):
+        raise HTTPException(status_code=403, detail="Invalid cron secret")
+    
+    top_n = min(max(top_n, 2), 50)
+    max_new = min(max(max_new, 1), 100)
+    
+    background_tasks.add_task(_prewarm_battles_background, top_n, max_new)
+    return {"status": "started", "top_n": top_n, "max_new": max_new}
+
+
+async def _prewarm_battles_background(top_n: int, max_new: int):
+    from app.database import async_session
+    from app.jobs.battle_prewarm import prewarm_popular_battles
+    
+    async with async_session() as db:
+        try:
+            result = await prewarm_popular_battles(db, top_n=top_n, max_new=max_new)
+            logger.info(f"⚔️ Battle prewarm result: {result}")
+        except Exception as e:
+            logger.error(f"❌ Battle prewarm failed: {e}")
+
+
 # ─── Seed Endpoint (dev only) ─────────────────────────────
 
 @app.post("/api/seed")
@@ -254,6 +292,8 @@ async def delete_movie(
     title = movie.title
     await db.delete(movie)
     await db.commit()
+    await cache_service.delete_prefix("movies:")
+    await cache_service.delete(f"status:{tmdb_id}")
     return {"status": "deleted", "title": title, "tmdb_id": tmdb_id}
 
 
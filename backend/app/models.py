@@ -5,7 +5,7 @@ Worth the Watch? — SQLAlchemy Models
 from datetime import datetime
 from sqlalchemy import (
     Column, Integer, String, Text, Float, Boolean, DateTime, Date,
-    ForeignKey, JSON, Index
+    ForeignKey, JSON, Index, Computed, text
 )
 from sqlalchemy.orm import relationship
 from app.database import Base
@@ -22,6 +22,20 @@ class Movie(Base):
     overview = Column(Text)
     poster_path = Column(String(255))
     backdrop_path = Column(String(255))
+    # Full image URLs, generated by Postgres on write so list pages don't
+    # rebuild them per row. Mirrors TMDBService.get_poster_url/get_backdrop_url.
+    poster_url = Column(Text, Computed(
+        "CASE WHEN poster_path IS NULL OR poster_path = '' THEN NULL "
+        "WHEN poster_path LIKE 'http%' THEN poster_path "
+        "ELSE 'https://image.tmdb.org/t/p/w500' || poster_path END",
+        persisted=True,
+    ))
+    backdrop_url = Column(Text, Computed(
+        "CASE WHEN backdrop_path IS NULL OR backdrop_path = '' THEN NULL "
+        "WHEN backdrop_path LIKE 'http%' THEN backdrop_path "
+        "ELSE 'https://image.tmdb.org/t/p/w1280' || backdrop_path END",
+        persisted=True,
+    ))
     genres = Column(JSON)  # [{"id": 28, "name": "Action"}, ...]
     release_date = Column(Date)
     tmdb_popularity = Column(Float)
@@ -33,9 +47,21 @@ class Movie(Base):
     # Relationship
     review = relationship("Review", back_populates="movie", uselist=False, cascade="all, delete-orphan")
 
+    # Fetch the generated URL columns via RETURNING on insert/update instead
+    # of leaving them expired (a lazy refresh can't run under asyncio)
+    __mapper_args__ = {"eager_defaults": True}
+
     __table_args__ = (
         Index("idx_movies_release_date", "release_date"),
         Index("idx_movies_media_type", "media_type"),
+        # Status polling / review probes / quick_search — index-only
+        # tmdb_id -> (id, poster_path) lookup
+        Index("movies_tmdb_cover", "tmdb_id", postgresql_include=["id", "poster_path"]),
+        # /random only ever picks titles that have a poster
+        Index(
+            "idx_movies_has_poster_low_pop", "tmdb_popularity",
+            postgresql_where=text("poster_path IS NOT NULL"),
+        ),
     )
 
 
@@ -84,12 +110,19 @@ class Review(Base):
     critics_agree_with_reddit = Column(Boolean, nullable=True)
     tension_point = Column(Text, nullable=True)
 
+    # Precomputed review half of the Versus battle prompt
+    context_snippet = Column(Text, nullable=True)
+
     # Relationship
     movie = relationship("Movie", back_populates="review")
 
     __table_args__ = (
         Index("idx_reviews_verdict", "verdict"),
         Index("idx_reviews_generated_at", "generated_at"),
+        Index(
+            "idx_reviews_worth_movie", "movie_id",
+            postgresql_where=text("verdict = 'WORTH IT'"),
+        ),
     )
 
 
@@ -0,0 +1,29 @@
+"""
+Worth the Watch? — Response Classes
+orjson-backed JSON response. orjson is a C extension and serializes the
+dict/str-heavy movie payloads 2-5x faster than the stdlib encoder.
+"""
+
+from typing import Any
+
+import orjson
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+
+def _default(obj: Any) -> Any:
+    """orjson fallback for types it doesn't know (date/datetime are native)."""
+    if isinstance(obj, BaseModel):
+        return obj.model_dump()
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+class ORJSONResponse(JSONResponse):
+    """
+    JSONResponse rendered with orjson (handles date/datetime natively).
+    Pydantic models can be returned as-is, nested or not — they're dumped in
+    place, so handlers don't need FastAPI's response_model/jsonable_encoder pass.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, default=_default)
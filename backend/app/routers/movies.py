@@ -3,118 +3,160 @@ Worth the Watch? — Movies Router
 Endpoints for listing and retrieving movies with reviews.
 """
 
+import asyncio
 import math
+import random
 from datetime import datetime, timedelta
 from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy import select, func, desc, and_, or_, cast, String
+from sqlalchemy import select, func, desc, and_, exists, bindparam, Integer, Select
+from sqlalchemy.dialects.postgresql import ARRAY
 
-from typing import Optional, List
-from sqlalchemy.orm import joinedload, Session
+from typing import Callable, Optional, List
+from sqlalchemy.orm import contains_eager, selectinload, Session
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.database import get_db
 from app.models import Movie, Review
-from app.schemas import MovieResponse, ReviewResponse, MovieWithReview, PaginatedMovies
-from app.services.tmdb import tmdb_service
+from app.responses import ORJSONResponse
+from app.schemas import (
+    MovieResponse, MovieWithReview, PaginatedMovies,
+    movie_with_review_dict,
+)
+from app.services.cache import cache_service
+from app.services.tmdb import tmdb_service, parse_iso_date
 from app.services.safety import is_safe_content
 
-router = APIRouter()
-
-# ─── Mood → Tag + Genre Mapping ───────────────────────────────────────
-# PRIMARY: LLM-generated review tags (most accurate for mood)
-# SECONDARY: TMDB genres with EXCLUSION rules (prevents Breaking Bad in "emotional")
-#
-# Tags are assigned by the LLM during review generation and are mood-specific.
-# Genres alone are too broad — "Drama" covers everything from The Notebook to Breaking Bad.
-# Exclusion genres prevent wrong-mood results from leaking in.
-
-MOOD_CONFIG = {
-    "tired": {
-        # Easy, light, comfort watches — unwind without thinking
-        "tags": ["Feel-Good", "Whimsical", "Family-Friendly", "Funny", "Light", "Comforting", "Wholesome"],
-        "include_genres": ["Comedy", "Romance", "Animation", "Family", "Music"],
-        "exclude_genres": ["Horror", "Thriller", "Crime", "War"],
-    },
-    "pumped": {
-        # Adrenaline, high-octane — John Wick, Mad Max, Top Gun
-        "tags": ["Action-Packed", "Gritty", "Fast-Paced", "Violent", "Intense", "Thrilling"],
-        "include_genres": ["Action", "War"],
-        "exclude_genres": ["Romance", "Family", "Animation", "Music"],
-    },
-    "emotional": {
-        # Tearjerkers, deep feelings — Green Mile, Schindler's List, Grave of the Fireflies
-        "tags": ["Emotional", "Heartbreaking", "Tearjerker", "Moving", "Touching", "Heartfelt", "Devastating"],
-        "include_genres": ["Drama", "Romance"],
-        "exclude_genres": ["Action", "Thriller", "Crime", "Horror", "Science Fiction"],
-    },
-    "cerebral": {
-        # Mind-benders, make you think — Inception, Memento, Arrival, Interstellar
-        "tags": ["Mind-Bending", "Cerebral", "Slow-Burn", "Thought-Provoking", "Complex", "Philosophical"],
-        "include_genres": ["Science Fiction", "Mystery"],
-        "exclude_genres": ["Comedy", "Family", "Animation", "Romance"],
-    },
-    "fun": {
-        # Popcorn entertainment — Jurassic Park, Guardians, Spider-Verse
-        "tags": ["Funny", "Feel-Good", "Whimsical", "Entertaining", "Adventure", "Escapist"],
-        "include_genres": ["Comedy", "Animation", "Adventure", "Fantasy"],
-        "exclude_genres": ["Horror", "War", "Crime"],
-    },
+router = APIRouter(default_response_class=ORJSONResponse)
+
+# Cache TTLs (seconds). Everything under "movies:" is dropped whenever the
+# pipeline's review write commits (see pipeline._invalidate_movie_caches).
+COUNT_CACHE_TTL = 60
+RESPONSE_CACHE_TTL = 60
+RANDOM_CACHE_TTL = 5  # short so shuffles still feel random
+# TMDB proxies — keyed under "tmdb:" since our review writes don't affect them
+PROVIDERS_CACHE_TTL = 1800
+TMDB_CACHE_TTL = 3600
+
+
+# ─── Category Builders ───────────────────────────────────
+# One builder per `category` value, resolved with a dict lookup instead of
+# an if/elif cascade. Each takes the base query and returns it with the
+# category's joins, filters and ordering applied. Totals are derived from
+# the same query (see _count_of), so there is no mirrored count query.
+
+def _build_trending(query: Select) -> Select:
+    return query.order_by(desc(Movie.tmdb_popularity))
+
+
+def _build_latest(query: Select) -> Select:
+    return query.join(Review).order_by(desc(Review.generated_at))
+
+
+def _build_worth_it(query: Select) -> Select:
+    # Shuffled via a random OFFSET in list_movies (see _RANDOM_CATEGORIES)
+    return query.join(Review).where(
+        Review.verdict == "WORTH IT"
+    ).order_by(Movie.id)
+
+
+def _build_skip_these(query: Select) -> Select:
+    return query.join(Review).where(Review.verdict == "NOT WORTH IT").order_by(desc(Review.generated_at))
+
+
+def _build_mixed_bag(query: Select) -> Select:
+    return query.join(Review).where(Review.verdict == "MIXED BAG").order_by(desc(Review.generated_at))
+
+
+def _build_hidden_gems(query: Select) -> Select:
+    hidden_gem = and_(
+        Review.verdict == "WORTH IT",
+        Movie.tmdb_popularity < 20,
+    )
+    return query.join(Review).where(hidden_gem).order_by(Movie.id)
+
+
+def _build_movies(query: Select) -> Select:
+    return query.where(Movie.media_type == "movie").order_by(desc(Movie.release_date))
+
+
+def _build_tv_shows(query: Select) -> Select:
+    # Anti-join: drop shows we said to skip, keep unreviewed ones.
+    # NOT EXISTS lets the planner probe reviews.movie_id instead of
+    # materializing the whole outer join before filtering.
+    not_skipped = ~exists().where(
+        and_(Review.movie_id == Movie.id, Review.verdict == "NOT WORTH IT")
+    )
+    return query.where(
+        Movie.media_type == "tv", not_skipped
+    ).order_by(desc(Movie.release_date))
+
+
+_CATEGORY_BUILDERS: dict[str, Callable[[Select], Select]] = {
+    "trending": _build_trending,
+    "latest": _build_latest,
+    "worth-it": _build_worth_it,
+    "skip-these": _build_skip_these,
+    "mixed-bag": _build_mixed_bag,
+    "hidden-gems": _build_hidden_gems,
+    "movies": _build_movies,
+    "tv-shows": _build_tv_shows,
 }
 
+# Categories served in random order. ORDER BY random() scores and sorts every
+# candidate row; instead these builders order by the primary key and
+# list_movies reads a random window of `limit` rows from the known count,
+# then shuffles that page in Python.
+_RANDOM_CATEGORIES = {"worth-it", "hidden-gems"}
 
-def _build_mood_filter(mood: str):
-    """
-    Build SQLAlchemy filter for mood-based browsing.
-    
-    Strategy: Tags first (most accurate), genres second (with exclusions).
-    
-    A movie matches a mood if:
-      - It has ANY matching tag (LLM assigned, most reliable), OR
-      - It has an included genre AND does NOT have any excluded genre
-    
-    This prevents "Breaking Bad" from showing in "Emotional" (it's Drama 
-    but also Crime+Thriller which are excluded) while keeping "The Green Mile" 
-    (Drama with no excluded genres).
-    """
-    config = MOOD_CONFIG.get(mood)
-    if not config:
-        return None
 
-    conditions = []
+def _build_mood_category(query: Select, mood: str, shuffle: bool) -> Select:
+    """Mood categories (curated lists)."""
+    from app.services.curated_moods import CURATED_MOODS
 
-    # 1. TAG MATCHING (primary — most accurate mood signal)
-    for tag in config["tags"]:
-        conditions.append(
-            cast(Review.tags, String).ilike(f'%{tag}%')
-        )
+    curated_ids = CURATED_MOODS.get(mood, [])
 
-    # 2. GENRE MATCHING with exclusions (secondary — broader but filtered)
-    genre_includes = []
-    for genre in config["include_genres"]:
-        genre_includes.append(
-            cast(Movie.genres, String).ilike(f'%{genre}%')
-        )
+    if not curated_ids:
+        # Unknown mood — fall back to all reviewed
+        return query.join(Review).where(
+            Review.verdict == "WORTH IT"
+        ).order_by(desc(Movie.tmdb_popularity))
 
-    genre_excludes = []
-    for genre in config["exclude_genres"]:
-        genre_excludes.append(
-            cast(Movie.genres, String).ilike(f'%{genre}%')
-        )
+    # Shuffle: randomize the curated order
+    if shuffle:
+        curated_ids = list(curated_ids)
+        random.shuffle(curated_ids)
 
-    # Movie has at least one included genre AND none of the excluded genres
-    if genre_includes:
-        has_included = or_(*genre_includes)
-        if genre_excludes:
-            has_excluded = or_(*genre_excludes)
-            # Include genre match BUT NOT excluded genre
-            genre_condition = and_(has_included, ~has_excluded)
-        else:
-            genre_condition = has_included
-        conditions.append(genre_condition)
+    # Get movies from our DB matching curated TMDB IDs
+    # Include all — reviewed and unreviewed — with reviews loaded.
+    # ORDER BY ord keeps the curated (or shuffled) order server-side so
+    # LIMIT/OFFSET page through the list as curated.
+    curated = _tmdb_id_table("curated_ids", curated_ids)
+    return query.join(curated, curated.c.id == Movie.tmdb_id).order_by(curated.c.ord)
+
+
+def _tmdb_id_table(name: str, ids: list[int]):
+    """
+    unnest(:ids) WITH ORDINALITY AS c(id, ord) — an ordered list of TMDB ids
+    as a derived table. The planner hash-joins the small id set, and the
+    single ARRAY bind param (not ARRAY[...] with one param per id) keeps the
+    compiled statement cached regardless of list length.
+    """
+    return func.unnest(
+        bindparam(name, ids, type_=ARRAY(Integer))
+    ).table_valued(
+        "id", with_ordinality="ord"
+    ).render_derived(name="c")
 
-    return or_(*conditions)
 
+def _count_of(query: Select) -> Select:
+    """COUNT(*) over a list query's joins/filters, without its ordering."""
+    return query.with_only_columns(func.count(), maintain_column_froms=True).order_by(None)
 
-@router.get("", response_model=PaginatedMovies)
+
+# response_model=None: rows are serialized straight to dicts (see
+# movie_with_review_dict) and returned as an ORJSONResponse, so FastAPI
+# skips both validation and its jsonable_encoder walk over the page.
+# `responses` keeps the schema in the docs. /random and /{tmdb_id} do the same.
+@router.get("", response_model=None, responses={200: {"model": PaginatedMovies}})
 async def list_movies(
     page: int = Query(1, ge=1),
     limit: int = Query(20, ge=1, le=50),
@@ -128,108 +170,25 @@ async def list_movies(
     shuffle: bool = Query(False, description="Randomize results (for mood shuffle button)"),
     db: AsyncSession = Depends(get_db),
 ):
-    query = select(Movie).options(joinedload(Movie.review))
-    count_query = select(func.count()).select_from(Movie)
-
-    if category:
-        if category == "trending":
-            query = query.order_by(desc(Movie.tmdb_popularity))
-
-        elif category == "latest":
-            query = query.join(Review).order_by(desc(Review.generated_at))
-            count_query = count_query.join(Review)
-
-        elif category == "worth-it":
-            query = query.join(Review).where(
-                Review.verdict == "WORTH IT"
-            ).order_by(func.random())
-            count_query = count_query.join(Review).where(Review.verdict == "WORTH IT")
-
-        elif category == "skip-these":
-            query = query.join(Review).where(Review.verdict == "NOT WORTH IT").order_by(desc(Review.generated_at))
-            count_query = count_query.join(Review).where(Review.verdict == "NOT WORTH IT")
-
-        elif category == "mixed-bag":
-            query = query.join(Review).where(Review.verdict == "MIXED BAG").order_by(desc(Review.generated_at))
-            count_query = count_query.join(Review).where(Review.verdict == "MIXED BAG")
-
-        elif category == "hidden-gems":
-            query = query.join(Review).where(
-                and_(
-                    Review.verdict == "WORTH IT",
-                    Movie.tmdb_popularity < 20,
-                )
-            ).order_by(func.random())
-            count_query = count_query.join(Review).where(
-                and_(
-                    Review.verdict == "WORTH IT",
-                    Movie.tmdb_popularity < 20,
-                )
-            )
-
-        elif category == "movies":
-            query = query.where(Movie.media_type == "movie").order_by(desc(Movie.release_date))
-            count_query = count_query.where(Movie.media_type == "movie")
-
-        elif category == "tv-shows":
-            query = query.join(Review, isouter=True).where(
-                and_(
-                    Movie.media_type == "tv",
-                    or_(Review.verdict != "NOT WORTH IT", Review.verdict.is_(None))
-                )
-            ).order_by(desc(Movie.release_date))
-            count_query = count_query.join(Review, isouter=True).where(
-                and_(
-                    Movie.media_type == "tv",
-                    or_(Review.verdict != "NOT WORTH IT", Review.verdict.is_(None))
-                )
-            )
-
-        # ─── Mood Categories (Curated Lists) ─────────────────────────
-        elif category.startswith("mood-"):
-            from app.services.curated_moods import CURATED_MOODS
-            import random as _random
-
-            mood = category.replace("mood-", "")
-            curated_ids = CURATED_MOODS.get(mood, [])
-
-            if not curated_ids:
-                # Unknown mood — fall back to all reviewed
-                query = query.join(Review).where(
-                    Review.verdict == "WORTH IT"
-                ).order_by(desc(Movie.tmdb_popularity))
-                count_query = count_query.join(Review).where(
-                    Review.verdict == "WORTH IT"
-                )
-            else:
-                # Shuffle: randomize the curated order
-                if shuffle:
-                    curated_ids = list(curated_ids)
-                    _random.shuffle(curated_ids)
-
-                # Get movies from our DB matching curated TMDB IDs
-                # Include all — reviewed and unreviewed — with reviews loaded
-                query = query.where(
-                    Movie.tmdb_id.in_(curated_ids)
-                )
-                count_query = count_query.where(
-                    Movie.tmdb_id.in_(curated_ids)
-                )
-
-                # We need custom ordering to match the curated list order
-                # SQLAlchemy doesn't support CASE ordering easily, so we'll
-                # fetch all and sort in Python after the query executes
-                # For now, use popularity as proxy (most iconic = most popular)
-                if not shuffle:
-                    query = query.order_by(desc(Movie.tmdb_popularity))
-
+    cache_key = f"movies:list:{page}:{limit}:{category}:{sort}:{verdict}:{media_type}:{shuffle}"
+    cached = await cache_service.get(cache_key)
+    if cached is not None:
+        return ORJSONResponse(cached)
+
+    # selectinload: the category branches already join reviews for filtering,
+    # so a joined eager load would join it a second time and force a
+    # Python-side unique() pass. A follow-up IN query keeps rows 1:1.
+    query = select(Movie).options(selectinload(Movie.review))
+
+    if category and category.startswith("mood-"):
+        query = _build_mood_category(query, category.removeprefix("mood-"), shuffle)
+    elif category:
+        query = _CATEGORY_BUILDERS[category](query)
     else:
         if media_type:
             query = query.where(Movie.media_type == media_type)
-            count_query = count_query.where(Movie.media_type == media_type)
         if verdict:
             query = query.join(Review).where(Review.verdict == verdict)
-            count_query = count_query.join(Review).where(Review.verdict == verdict)
 
         sort = sort or "latest"
         if sort == "latest":
@@ -245,93 +204,137 @@ async def list_movies(
         elif sort == "verdict" and verdict:
             query = query.order_by(desc(Review.generated_at))
 
-    total_result = await db.execute(count_query)
-    total = total_result.scalar() or 0
+    # Totals move slowly relative to page views — cache them briefly
+    count_key = f"movies:count:{category}:{verdict}:{media_type}"
+    total = await cache_service.get(count_key)
+    if total is None and category in _RANDOM_CATEGORIES:
+        # The random window needs the total up front
+        total = (await db.execute(_count_of(query))).scalar() or 0
+        await cache_service.set(count_key, total, ttl=COUNT_CACHE_TTL)
 
-    offset = (page - 1) * limit
+    if category in _RANDOM_CATEGORIES:
+        offset = random.randint(0, max(total - limit, 0))
+    else:
+        offset = (page - 1) * limit
     query = query.offset(offset).limit(limit)
-    result = await db.execute(query)
-    movies = result.unique().scalars().all()
-
-    return PaginatedMovies(
-        movies=[_format_movie_with_review(m) for m in movies],
-        total=total,
-        page=page,
-        pages=math.ceil(total / limit) if total > 0 else 0,
-    )
 
+    if total is None:
+        # Cache miss: COUNT(*) OVER () returns the total with the page rows
+        # in one round trip instead of a second JOIN/WHERE pass.
+        result = await db.execute(query.add_columns(func.count().over().label("total")))
+        rows = result.all()
+        movies = [row[0] for row in rows]
+        if rows:
+            total = rows[0].total
+        else:
+            # Past the last page — no rows to carry the window value
+            total = (await db.execute(_count_of(query.offset(None).limit(None)))).scalar() or 0
+        await cache_service.set(count_key, total, ttl=COUNT_CACHE_TTL)
+    else:
+        result = await db.execute(query)
+        movies = list(result.scalars().all())
+
+    if category in _RANDOM_CATEGORIES:
+        random.shuffle(movies)
 
-@router.get("/random", response_model=MovieWithReview)
+    response = {
+        "movies": [movie_with_review_dict(m) for m in movies],
+        "total": total,
+        "page": page,
+        "pages": math.ceil(total / limit) if total > 0 else 0,
+    }
+    ttl = RANDOM_CACHE_TTL if shuffle or category in _RANDOM_CATEGORIES else RESPONSE_CACHE_TTL
+    await cache_service.set(cache_key, response, ttl=ttl)
+    return ORJSONResponse(response)
+
+
+async def _pick_random(db: AsyncSession, query: Select) -> Optional[Movie]:
+    """
+    Pick one random row of `query` with a count + random OFFSET.
+    Both statements walk the partial indexes on posters / WORTH IT reviews
+    instead of sorting every candidate by random().
+    """
+    total_result = await db.execute(query.with_only_columns(func.count()))
+    total = total_result.scalar() or 0
+    if not total:
+        return None
+    query = query.options(selectinload(Movie.review)).order_by(Movie.id)
+    result = await db.execute(query.offset(random.randint(0, total - 1)).limit(1))
+    return result.scalar_one_or_none()
+
+
+@router.get("/random", response_model=None, responses={200: {"model": MovieWithReview}})
 async def get_random_movie_with_review(
     exclude: Optional[int] = Query(None),
     db: AsyncSession = Depends(get_db),
 ):
     """Prefers hidden gems, falls back to any WORTH IT movie."""
-    # First: hidden gems
-    query = select(Movie).options(joinedload(Movie.review)).join(Review).where(
-        and_(
-            Review.verdict == "WORTH IT",
-            Movie.poster_path.is_not(None),
-            Movie.tmdb_popularity < 20,
-        )
+    cache_key = f"movies:random:{exclude}"
+    cached = await cache_service.get(cache_key)
+    if cached is not None:
+        return ORJSONResponse(cached)
+
+    worth_it = select(Movie).join(Review).where(
+        and_(Review.verdict == "WORTH IT", Movie.poster_path.is_not(None))
     )
+
+    # First: hidden gems
+    query = worth_it.where(Movie.tmdb_popularity < 20)
     if exclude:
         query = query.where(Movie.tmdb_id != exclude)
-    query = query.order_by(func.random()).limit(1)
-    result = await db.execute(query)
-    movie = result.unique().scalar_one_or_none()
+    movie = await _pick_random(db, query)
 
     # Second: any WORTH IT
     if not movie:
-        query = select(Movie).options(joinedload(Movie.review)).join(Review).where(
-            and_(Review.verdict == "WORTH IT", Movie.poster_path.is_not(None))
-        )
+        query = worth_it
         if exclude:
             query = query.where(Movie.tmdb_id != exclude)
-        query = query.order_by(func.random()).limit(1)
-        result = await db.execute(query)
-        movie = result.unique().scalar_one_or_none()
+        movie = await _pick_random(db, query)
 
     # Third: without exclude
     if not movie and exclude:
-        query = select(Movie).options(joinedload(Movie.review)).join(Review).where(
-            and_(Review.verdict == "WORTH IT", Movie.poster_path.is_not(None))
-        ).order_by(func.random()).limit(1)
-        result = await db.execute(query)
-        movie = result.unique().scalar_one_or_none()
+        movie = await _pick_random(db, worth_it)
 
     if not movie:
         raise HTTPException(status_code=404, detail="No reviewed movies found")
 
-    return _format_movie_with_review(movie)
-
+    response = movie_with_review_dict(movie)
+    await cache_service.set(cache_key, response, ttl=RANDOM_CACHE_TTL)
+    return ORJSONResponse(response)
 
 
-@router.get("/{tmdb_id}", response_model=MovieWithReview)
+@router.get("/{tmdb_id}", response_model=None, responses={200: {"model": MovieWithReview}})
 async def get_movie(
     tmdb_id: int,
     media_type: str = Query(None, pattern="^(movie|tv)$"),
     db: AsyncSession = Depends(get_db),
 ):
-    query = select(Movie).options(joinedload(Movie.review)).where(Movie.tmdb_id == tmdb_id)
-    if media_type:
-        query = query.where(Movie.media_type == media_type)
-    result = await db.execute(query)
-    movies = result.unique().scalars().all()
+    # Only DB-backed pages are cached; the TMDB fallback below is not
+    cache_key = f"movies:detail:{tmdb_id}:{media_type}"
+    cached = await cache_service.get(cache_key)
+    if cached is not None:
+        return ORJSONResponse(cached)
 
     # If multiple entries share the same tmdb_id (e.g. movie "Yellowknife" 
     # and TV show "The 100" both have tmdb_id 48866), prefer the one 
     # that has a review. This prevents showing the wrong title when 
-    # media_type is not specified in the URL.
-    movie = None
-    if len(movies) == 1:
-        movie = movies[0]
-    elif len(movies) > 1:
-        reviewed = [m for m in movies if m.review]
-        movie = reviewed[0] if reviewed else movies[0]
+    # media_type is not specified in the URL. Picked in SQL so only one
+    # row (with its review, via contains_eager) comes back.
+    query = (
+        select(Movie)
+        .outerjoin(Review, Review.movie_id == Movie.id)
+        .options(contains_eager(Movie.review))
+        .where(Movie.tmdb_id == tmdb_id)
+    )
+    if media_type:
+        query = query.where(Movie.media_type == media_type)
+    result = await db.execute(query.order_by(Review.id.is_(None)).limit(1))
+    movie = result.scalar_one_or_none()
 
     if movie:
-        return _format_movie_with_review(movie)
+        response = movie_with_review_dict(movie)
+        await cache_service.set(cache_key, response, ttl=RESPONSE_CACHE_TTL)
+        return ORJSONResponse(response)
 
     # ─── TMDB Fallback for movies not in our DB ──────────────
     # This handles Discover clicks, Coming Soon, and any movie
@@ -347,9 +350,16 @@ async def get_movie(
         elif media_type == "tv":
             tmdb_data = await tmdb_service.get_tv_details(tmdb_id)
         else:
-            tmdb_data = await tmdb_service.get_movie_details(tmdb_id)
-            if not tmdb_data or not tmdb_data.get("id"):
-                tmdb_data = await tmdb_service.get_tv_details(tmdb_id)
+            # Unknown type: probe both endpoints concurrently, prefer movie
+            movie_data, tv_data = await asyncio.gather(
+                tmdb_service.get_movie_details(tmdb_id),
+                tmdb_service.get_tv_details(tmdb_id),
+                return_exceptions=True,
+            )
+            if isinstance(movie_data, dict) and movie_data.get("id"):
+                tmdb_data = movie_data
+            elif isinstance(tv_data, dict):
+                tmdb_data = tv_data
                 detected_type = "tv"
 
         if not tmdb_data or not tmdb_data.get("id"):
@@ -385,18 +395,10 @@ async def get_movie(
                 elif isinstance(g, (int, str)):
                     genres.append({"id": g, "name": ""})
 
-        # Release date: handle strings, date objects, None, empty strings
-        parsed_release = None
-        raw_release = normalized.get("release_date") or tmdb_data.get("release_date") or tmdb_data.get("first_air_date")
-        if raw_release:
-            try:
-                from datetime import date as date_type
-                if isinstance(raw_release, str) and raw_release.strip():
-                    parsed_release = date_type.fromisoformat(raw_release.strip())
-                elif hasattr(raw_release, "isoformat"):
-                    parsed_release = raw_release
-            except (ValueError, TypeError):
-                parsed_release = None
+        # Release date: normalize_result already parsed it; raw TMDB strings otherwise
+        parsed_release = normalized.get("release_date") or parse_iso_date(
+            tmdb_data.get("release_date") or tmdb_data.get("first_air_date")
+        )
 
         # Numeric fields
         tmdb_pop = None
@@ -426,7 +428,7 @@ async def get_movie(
             poster_url=tmdb_service.get_poster_url(poster_path),
             backdrop_url=tmdb_service.get_backdrop_url(backdrop_path),
         )
-        return MovieWithReview(movie=movie_resp, review=None)
+        return ORJSONResponse(MovieWithReview(movie=movie_resp, review=None))
 
     except HTTPException:
         raise
@@ -442,6 +444,11 @@ async def get_streaming_availability(
     region: str = Query("US", max_length=2),
     db: AsyncSession = Depends(get_db),
 ):
+    cache_key = f"tmdb:providers:{tmdb_id}:{region}"
+    cached = await cache_service.get(cache_key)
+    if cached is not None:
+        return cached
+
     result = await db.execute(select(Movie).where(Movie.tmdb_id == tmdb_id))
     movie = result.scalar_one_or_none()
     media_type = movie.media_type if movie else "movie"
@@ -460,11 +467,15 @@ async def get_streaming_availability(
     buy = [format_provider(p) for p in providers.get("buy", [])]
     free = [format_provider(p) for p in (providers.get("free", []) + providers.get("ads", []))]
 
-    return {
+    response = {
         "available": bool(flatrate or rent or buy or free),
         "flatrate": flatrate, "rent": rent, "buy": buy, "free": free,
         "justwatch_link": providers.get("link", ""),
     }
+    # No link means TMDB had no data for the region (or the call failed)
+    if providers.get("link"):
+        await cache_service.set(cache_key, response, ttl=PROVIDERS_CACHE_TTL)
+    return response
 
 
 @router.get("/{tmdb_id}/credits")
@@ -474,6 +485,11 @@ async def get_movie_credits(
     db: AsyncSession = Depends(get_db),
 ):
     """Get cast list for a movie or TV show."""
+    cache_key = f"tmdb:credits:{media_type}:{tmdb_id}"
+    cached = await cache_service.get(cache_key)
+    if cached is not None:
+        return cached
+
     try:
         if media_type == "tv":
             credits = await tmdb_service.get_tv_credits(tmdb_id)
@@ -494,6 +510,8 @@ async def get_movie_credits(
                 "profile_url": f"https://image.tmdb.org/t/p/w185{person['profile_path']}" if person.get("profile_path") else None,
             })
         
+        # Cache the trimmed cast, not the full TMDB credits payload
+        await cache_service.set(cache_key, {"cast": cast}, ttl=TMDB_CACHE_TTL)
         return {"cast": cast}
     except Exception as e:
         return {"cast": []}
@@ -512,56 +530,50 @@ async def get_recommendations(
         else:
             endpoint = f"/movie/{tmdb_id}/recommendations"
 
-        data = await tmdb_service._get(endpoint, params={"language": "en-US"})
-        raw = data.get("results", [])
-
-        results = []
-        tmdb_ids = []
-        for item in raw[:15]:
-            if not item.get("poster_path"):
-                continue
-            mt = item.get("media_type", media_type)
-            title = item.get("title") or item.get("name") or ""
-            poster = item.get("poster_path")
-            results.append({
-                "tmdb_id": item["id"],
-                "title": title,
-                "media_type": mt,
-                "poster_url": f"https://image.tmdb.org/t/p/w500{poster}" if poster else None,
-                "tmdb_vote_average": item.get("vote_average"),
-                "release_date": item.get("release_date") or item.get("first_air_date"),
-            })
-            tmdb_ids.append(item["id"])
-
-        # Cross-reference with our review DB for verdicts
+        # Only the TMDB half is cached; verdicts below are always fresh
+        cache_key = f"tmdb:recs:{media_type}:{tmdb_id}"
+        results = await cache_service.get(cache_key)
+        if results is None:
+            data = await tmdb_service._get(endpoint, params={"language": "en-US"})
+            raw = data.get("results", [])
+
+            results = []
+            for item in raw[:15]:
+                if not item.get("poster_path"):
+                    continue
+                mt = item.get("media_type", media_type)
+                title = item.get("title") or item.get("name") or ""
+                poster = item.get("poster_path")
+                results.append({
+                    "tmdb_id": item["id"],
+                    "title": title,
+                    "media_type": mt,
+                    "poster_url": f"https://image.tmdb.org/t/p/w500{poster}" if poster else None,
+                    "tmdb_vote_average": item.get("vote_average"),
+                    "release_date": item.get("release_date") or item.get("first_air_date"),
+                })
+            if raw:
+                await cache_service.set(cache_key, results, ttl=TMDB_CACHE_TTL)
+        tmdb_ids = [r["tmdb_id"] for r in results]
+
+        # Cross-reference with our review DB for verdicts: exactly one row
+        # per input id, in input order, so it zips straight onto `results`
         if tmdb_ids:
+            ids = _tmdb_id_table("tmdb_ids", tmdb_ids)
+            verdict = (
+                select(Review.verdict)
+                .join(Movie, Review.movie_id == Movie.id)
+                .where(Movie.tmdb_id == ids.c.id)
+                .limit(1)
+                .scalar_subquery()
+            )
             reviewed = await db.execute(
-                select(Movie.tmdb_id, Review.verdict)
-                .join(Review, Review.movie_id == Movie.id)
-                .where(Movie.tmdb_id.in_(tmdb_ids))
+                select(ids.c.id, verdict.label("verdict")).order_by(ids.c.ord)
             )
-            verdict_map = {row.tmdb_id: row.verdict for row in reviewed.all()}
-            for r in results:
-                r["verdict"] = verdict_map.get(r["tmdb_id"])
-                r["has_review"] = r["tmdb_id"] in verdict_map
+            for r, row in zip(results, reviewed.all()):
+                r["verdict"] = row.verdict
+                r["has_review"] = row.verdict is not None
 
         return {"results": results}
     except Exception as e:
         return {"results": []}
-
-
-def _format_movie_with_review(movie: Movie) -> MovieWithReview:
-    movie_resp = MovieResponse(
-        id=movie.id, tmdb_id=movie.tmdb_id, title=movie.title,
-        media_type=movie.media_type, overview=movie.overview,
-        poster_path=movie.poster_path, backdrop_path=movie.backdrop_path,
-        genres=movie.genres, release_date=movie.release_date,
-        tmdb_popularity=movie.tmdb_popularity,
-        tmdb_vote_average=movie.tmdb_vote_average,
-        poster_url=tmdb_service.get_poster_url(movie.poster_path),
-        backdrop_url=tmdb_service.get_backdrop_url(movie.backdrop_path),
-    )
-    review_resp = None
-    if movie.review:
-        review_resp = ReviewResponse.model_validate(movie.review)
-    return MovieWithReview(movie=movie_resp, review=review_resp)
\ No newline at end of file
@@ -12,19 +12,60 @@ The discover endpoint with release_date filters gives us clean,
 accurate results every time.
 """
 
+import asyncio
 import logging
 from datetime import date, timedelta
 from fastapi import APIRouter, Query
+from app.responses import ORJSONResponse
+from app.services.cache import cache_service
 from app.services.tmdb import tmdb_service
 from app.services.safety import is_safe_content
 
 logger = logging.getLogger(__name__)
 
-router = APIRouter()
+router = APIRouter(default_response_class=ORJSONResponse)
 
 TMDB_IMG = "https://image.tmdb.org/t/p/w500"
 TMDB_BACKDROP = "https://image.tmdb.org/t/p/w1280"
 
+# Discover results change at most daily. Keys carry today's date, so the
+# date windows below roll over on their own; the TTL just bounds staleness.
+NP_CACHE_TTL = 6 * 60 * 60
+
+# In-flight TMDB fetches by cache key: concurrent cold-cache requests for the
+# same page await one shared fetch instead of each calling TMDB
+_inflight: dict[str, asyncio.Task] = {}
+
+
+async def _discover(cache_key: str, endpoint: str, params: dict) -> dict:
+    """tmdb_service._get, coalescing concurrent identical calls."""
+    task = _inflight.get(cache_key)
+    if task is None:
+        task = asyncio.ensure_future(tmdb_service._get(endpoint, params=params))
+        _inflight[cache_key] = task
+        task.add_done_callback(lambda _: _inflight.pop(cache_key, None))
+    # shield: one client disconnecting must not cancel the shared fetch
+    return await asyncio.shield(task)
+
+
+# ISO date strings for the discover windows, rebuilt only when the day changes
+_DATE_CACHE: dict = {"day": None, "strs": None}
+
+
+def _date_strs() -> tuple[str, str, str, str, str]:
+    """(today, 45 days ago, 90 days ago, tomorrow, 90 days out) as ISO strings."""
+    d = date.today()
+    if d != _DATE_CACHE["day"]:
+        _DATE_CACHE["strs"] = (
+            d.isoformat(),
+            (d - timedelta(days=45)).isoformat(),
+            (d - timedelta(days=90)).isoformat(),
+            (d + timedelta(days=1)).isoformat(),
+            (d + timedelta(days=90)).isoformat(),
+        )
+        _DATE_CACHE["day"] = d
+    return _DATE_CACHE["strs"]
+
 
 def _format_result(item: dict, media_type: str) -> dict:
     """Format a TMDB result into a consistent shape."""
@@ -49,6 +90,17 @@ def _format_result(item: dict, media_type: str) -> dict:
     }
 
 
+def _format_results(results: list, media_type: str, limit: int = 20) -> list:
+    """Format displayable results, stopping once `limit` have been accepted."""
+    formatted = []
+    for item in results:
+        if item.get("poster_path") and is_safe_content(item):
+            formatted.append(_format_result(item, media_type))
+            if len(formatted) == limit:
+                break
+    return formatted
+
+
 @router.get("/theaters")
 async def now_in_theaters(
     region: str = Query("US", description="ISO 3166-1 country code"),
@@ -60,33 +112,40 @@ async def now_in_theaters(
     Only shows movies with theatrical releases and decent vote counts.
     """
     try:
-        today = date.today()
-        forty_five_days_ago = today - timedelta(days=45)
+        today, forty_five_days_ago, _, _, _ = _date_strs()
+        cache_key = f"np:theaters:{region}:{page}:{today}"
+        cached = await cache_service.get(cache_key)
+        if cached is not None:
+            return cached
 
-        data = await tmdb_service._get(
+        data = await _discover(
+            cache_key,
             "/discover/movie",
-            params={
+            {
                 "page": page,
                 "region": region,
                 "language": "en-US",
                 "sort_by": "popularity.desc",
                 "with_release_type": "2|3",  # 2=theatrical, 3=theatrical (limited)
-                "primary_release_date.gte": forty_five_days_ago.isoformat(),
-                "primary_release_date.lte": today.isoformat(),
+                "primary_release_date.gte": forty_five_days_ago,
+                "primary_release_date.lte": today,
                 "vote_count.gte": 10,  # At least some votes
                 "include_adult": "false",
             },
         )
 
         results = data.get("results", [])
-        movies = [_format_result(m, "movie") for m in results if m.get("poster_path") and is_safe_content(m)]
+        movies = _format_results(results, "movie")
 
-        return {
+        response = {
             "section": "In Theaters",
-            "results": movies[:20],
+            "results": movies,
             "total": data.get("total_results", 0),
             "page": page,
         }
+        if results:
+            await cache_service.set(cache_key, response, ttl=NP_CACHE_TTL)
+        return response
     except Exception as e:
         logger.error(f"Failed to fetch now playing: {e}")
         return {"section": "In Theaters", "results": [], "total": 0, "page": 1}
@@ -102,31 +161,38 @@ async def new_on_streaming(
     long-running shows that technically have "new episodes this week."
     """
     try:
-        today = date.today()
-        ninety_days_ago = today - timedelta(days=90)
+        today, _, ninety_days_ago, _, _ = _date_strs()
+        cache_key = f"np:streaming:{page}:{today}"
+        cached = await cache_service.get(cache_key)
+        if cached is not None:
+            return cached
 
-        data = await tmdb_service._get(
+        data = await _discover(
+            cache_key,
             "/discover/tv",
-            params={
+            {
                 "page": page,
                 "language": "en-US",
                 "sort_by": "popularity.desc",
-                "first_air_date.gte": ninety_days_ago.isoformat(),
-                "first_air_date.lte": today.isoformat(),
+                "first_air_date.gte": ninety_days_ago,
+                "first_air_date.lte": today,
                 "vote_count.gte": 5,
                 "include_adult": "false",
             },
         )
 
         results = data.get("results", [])
-        shows = [_format_result(s, "tv") for s in results if s.get("poster_path") and is_safe_content(s)]
+        shows = _format_results(results, "tv")
 
-        return {
+        response = {
             "section": "New on Streaming",
-            "results": shows[:20],
+            "results": shows,
             "total": data.get("total_results", 0),
             "page": page,
         }
+        if results:
+            await cache_service.set(cache_key, response, ttl=NP_CACHE_TTL)
+        return response
     except Exception as e:
         logger.error(f"Failed to fetch new streaming: {e}")
         return {"section": "New on Streaming", "results": [], "total": 0, "page": 1}
@@ -143,33 +209,59 @@ async def upcoming_movies(
     This prevents 1986 movies from showing as "coming soon."
     """
     try:
-        today = date.today()
-        tomorrow = today + timedelta(days=1)
-        ninety_days_out = today + timedelta(days=90)
+        today, _, _, tomorrow, ninety_days_out = _date_strs()
+        cache_key = f"np:upcoming:{region}:{page}:{today}"
+        cached = await cache_service.get(cache_key)
+        if cached is not None:
+            return cached
 
-        data = await tmdb_service._get(
+        data = await _discover(
+            cache_key,
             "/discover/movie",
-            params={
+            {
                 "page": page,
                 "region": region,
                 "language": "en-US",
                 "sort_by": "popularity.desc",  # Most anticipated first
-                "primary_release_date.gte": tomorrow.isoformat(),
-                "primary_release_date.lte": ninety_days_out.isoformat(),
+                "primary_release_date.gte": tomorrow,
+                "primary_release_date.lte": ninety_days_out,
                 "with_release_type": "2|3",  # Theatrical releases only
                 "include_adult": "false",
             },
         )
 
         results = data.get("results", [])
-        movies = [_format_result(m, "movie") for m in results if m.get("poster_path") and is_safe_content(m)]
+        movies = _format_results(results, "movie")
 
-        return {
+        response = {
             "section": "Coming Soon",
-            "results": movies[:20],
+            "results": movies,
             "total": data.get("total_results", 0),
             "page": page,
         }
+        if results:
+            await cache_service.set(cache_key, response, ttl=NP_CACHE_TTL)
+        return response
     except Exception as e:
         logger.error(f"Failed to fetch upcoming: {e}")
-        return {"section": "Coming Soon", "results": [], "total": 0, "page": 1}
\ No newline at end of file
+        return {"section": "Coming Soon", "results": [], "total": 0, "page": 1}
+
+@router.get("/home")
+async def home_sections(
+    region: str = Query("US", description="ISO 3166-1 country code"),
+):
+    """
+    First page of all three sections in one call, fetched concurrently.
+    Each section handles its own errors and caching, so one failing TMDB
+    call still returns the other two.
+    """
+    theaters, streaming, upcoming = await asyncio.gather(
+        now_in_theaters(region=region, page=1),
+        new_on_streaming(page=1),
+        upcoming_movies(region=region, page=1),
+    )
+    return {
+        "theaters": theaters,
+        "streaming": streaming,
+        "upcoming": upcoming,
+    }
@@ -6,37 +6,100 @@ Includes SSE streaming for real-time progress updates.
 
 import hashlib
 import os
-import json
 import asyncio
 import logging
+from functools import lru_cache
 
+import orjson
 from fastapi import APIRouter, Depends, Query, Request, BackgroundTasks
-from fastapi.responses import StreamingResponse
-from sqlalchemy import select, delete
+from fastapi.responses import Response, StreamingResponse
+from sqlalchemy import select, delete, exists, func, lambda_stmt
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import joinedload
+from sqlalchemy.orm import selectinload
 
 from app.database import get_db, async_session
-from app.models import Movie, Review, SearchEvent
-from app.schemas import MovieWithReview, MovieBase, MovieResponse, ReviewResponse, SearchResult
+from app.models import Movie, Review
+from app.responses import ORJSONResponse
+from app.schemas import (
+    MovieBase, MovieWithReview, ReviewResponse, SearchResult,
+    movie_with_review_dict,
+)
+from app.services.cache import cache_service
+from app.services.search_events import search_event_logger
 from app.services.tmdb import tmdb_service
 from app.services.pipeline import (
     get_or_create_movie,
     generate_review_for_movie,
     job_progress,
+    _invalidate_movie_caches,
 )
 from app.middleware.rate_limit import check_rate_limit
 
 logger = logging.getLogger(__name__)
 
-router = APIRouter(prefix="/search", tags=["Search"])
+router = APIRouter(prefix="/search", tags=["Search"], default_response_class=ORJSONResponse)
+
+# Dropdown results per query are stable for a while; let the browser reuse them
+QUICK_SEARCH_CACHE_CONTROL = "private, max-age=30"
+
+# SSE streams re-check at least this often without a progress event (seconds)
+SSE_WAKE_INTERVAL = 5
+
+# Status polls within this window share one DB probe (seconds)
+STATUS_CACHE_TTL = 2
+# A completed review only changes when it's rewritten or deleted. Pipeline
+# review writes and the regenerate endpoint drop the key on commit
+# (pipeline._invalidate_movie_caches); the admin delete drops it directly
+STATUS_COMPLETED_CACHE_TTL = 60 * 60
 
 # Salt for IP hashing (prevents rainbow table attacks)
 IP_HASH_SALT = os.getenv("IP_HASH_SALT", "wtw-default-salt-change-in-prod")
+# blake2b state with the salt already absorbed; copied per IP. This is
+# pseudonymization, not a commitment — an 8-byte digest gives the same
+# 16 hex chars we store, from stdlib's fastest hash on 64-bit CPUs.
+_SALTED_HASHER = hashlib.blake2b(f"{IP_HASH_SALT}:".encode(), digest_size=8)
+
+
+@lru_cache(maxsize=10000)
+def _hash_ip(raw_ip: str) -> str:
+    """Salted, truncated IP hash. Cached — client IPs repeat heavily."""
+    h = _SALTED_HASHER.copy()
+    h.update(raw_ip.encode())
+    return h.hexdigest()
+
+
+# Titles of movies already in our DB, for the local fuzzy match in
+# quick_search. Refreshed lazily; new titles show up within the TTL.
+LOCAL_TITLES_TTL = 10 * 60
+_local_titles: dict = {"titles": [], "loaded_at": None}
+
+
+async def _get_local_titles(db: AsyncSession) -> list[str]:
+    loop = asyncio.get_running_loop()
+    loaded_at = _local_titles["loaded_at"]
+    if loaded_at is None or loop.time() - loaded_at > LOCAL_TITLES_TTL:
+        result = await db.execute(select(Movie.title))
+        _local_titles["titles"] = result.scalars().all()
+        _local_titles["loaded_at"] = loop.time()
+    return _local_titles["titles"]
+
+
+def _conditional_json(request: Request, content: dict) -> Response:
+    """
+    JSON response with a body-hash ETag and a short private max-age, so
+    repeat keystrokes are served from the browser cache or as a 304.
+    """
+    body = orjson.dumps(content)
+    etag = 'W/"' + hashlib.blake2b(body, digest_size=8).hexdigest() + '"'
+    headers = {"ETag": etag, "Cache-Control": QUICK_SEARCH_CACHE_CONTROL}
+    if etag in request.headers.get("if-none-match", ""):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
 
 
 @router.get("/quick")
 async def quick_search(
+    request: Request,
     q: str = Query(..., min_length=2, max_length=200),
     db: AsyncSession = Depends(get_db),
 ):
@@ -47,54 +110,48 @@ async def quick_search(
     is_fuzzy = False
 
     # 1. Exact/Partial Search Results found?
-    if not tmdb_results:
-        # 2. Try Advanced Fuzzy Search
-        fuzzy_match = await tmdb_service.fuzzy_search(q)
-        if fuzzy_match:
+    if tmdb_results:
+        # Feed real hits back into the "Did you mean?" pool
+        tmdb_service.remember_titles(tmdb_results)
+    else:
+        # 2. Fuzzy match against popular + recently searched titles (rapidfuzz,
+        # in memory). Up to three trimmed prefixes are searched alongside it
+        # as a last resort — one concurrent fan-out, bounded at one RTT,
+        # instead of per-character sequential retries.
+        # Titles already in our DB are matched first (see fuzzy_search).
+        candidates = [q[:-i] for i in range(1, 4) if len(q) - i >= 3]
+        local_titles = await _get_local_titles(db)
+        fuzzy_match, *trimmed = await asyncio.gather(
+            tmdb_service.fuzzy_search(q, local_titles),
+            *(tmdb_service.search(c) for c in candidates),
+            return_exceptions=True,
+        )
+        trimmed_results = next((r for r in trimmed if r and isinstance(r, list)), None)
+        if fuzzy_match and isinstance(fuzzy_match, dict):
             tmdb_results = fuzzy_match["results"][:3]
             suggestion = fuzzy_match["suggestion"]
             is_fuzzy = True
-        
-        # 3. If Fuzzy fails, try Recursive Trimming
-        if not tmdb_results:
-            trimmed_q = q
-            while len(trimmed_q) > 3 and not tmdb_results:
-                trimmed_q = trimmed_q[:-1]
-                tmdb_results = await tmdb_service.search(trimmed_q)
-                if tmdb_results:
-                    is_fuzzy = True
-                    tmdb_results = tmdb_results[:3]
-                    break
+        elif trimmed_results:
+            tmdb_results = trimmed_results[:3]
+            is_fuzzy = True
 
     if not tmdb_results:
-        return {"results": [], "did_you_mean": False, "suggestion": None}
+        return _conditional_json(request, {"results": [], "did_you_mean": False, "suggestion": None})
     
     limit = 3 if is_fuzzy else 8
     tmdb_ids = [r["id"] for r in tmdb_results[:limit]]
     
+    # Only the columns the dropdown needs, with review existence as a
+    # correlated EXISTS — no Movie/Review entities loaded
     result = await db.execute(
-        select(Movie)
-        .where(Movie.tmdb_id.in_(tmdb_ids))
-    )
-    db_movies = {m.tmdb_id: m for m in result.scalars().all()}
-    
-    results = []
-    for item in tmdb_results[:limit]:
-        normalized = tmdb_service.normalize_result(item)
-        tmdb_id = item["id"]
-        db_movie = db_movies.get(tmdb_id)
-        has_review = False
-        poster_url = normalized.get("poster_url")
-        if db_movie:
-            pass
-
-    # Improved query with eager loading
-    result = await db.execute(
-        select(Movie)
-        .options(joinedload(Movie.review))
+        select(
+            Movie.tmdb_id,
+            Movie.poster_path,
+            exists().where(Review.movie_id == Movie.id).label("has_review"),
+        )
         .where(Movie.tmdb_id.in_(tmdb_ids))
     )
-    db_movies_map = {m.tmdb_id: m for m in result.unique().scalars().all()}
+    db_movies_map = {row.tmdb_id: row for row in result.all()}
 
     results = []
     for item in tmdb_results[:limit]:
@@ -106,8 +163,7 @@ async def quick_search(
         
         if tmdb_id in db_movies_map:
             db_m = db_movies_map[tmdb_id]
-            if db_m.review:
-                has_review = True
+            has_review = db_m.has_review
             if db_m.poster_path:
                 final_poster_url = tmdb_service.get_poster_url(db_m.poster_path)
 
@@ -117,63 +173,65 @@ async def quick_search(
             "poster_url": final_poster_url,
         })
     
-    return {"results": results, "did_you_mean": is_fuzzy, "suggestion": suggestion}
+    return _conditional_json(
+        request, {"results": results, "did_you_mean": is_fuzzy, "suggestion": suggestion}
+    )
 
 
-@router.get("", response_model=SearchResult)
+@router.get("", response_model=None, responses={200: {"model": SearchResult}})
 async def search_movies(
     q: str = Query(..., min_length=1, max_length=200, description="Search query"),
     request: Request = None,
-    background_tasks: BackgroundTasks = None,
     db: AsyncSession = Depends(get_db),
 ):
     """Search for a movie/show."""
     raw_ip = request.client.host if request.client else "unknown"
-    ip_hash = hashlib.sha256(f"{IP_HASH_SALT}:{raw_ip}".encode()).hexdigest()[:16]
-    db.add(SearchEvent(query=q, ip_hash=ip_hash))
-
-    result = await db.execute(
-        select(Movie)
-        .options(joinedload(Movie.review))
-        .where(Movie.title.ilike(f"%{q}%"))
-        .limit(8)
+    ip_hash = _hash_ip(raw_ip)
+    # Analytics are queued and written in batches off the request path
+    search_event_logger.log(q, ip_hash)
+
+    # Substring match on lower(title), exact/prefix matches first, then the
+    # shortest titles. Plain LIKE works without pg_trgm; where the extension
+    # is installed the movies_title_trgm GIN index
+    # (scripts/add_performance_indexes.py) serves it instead of a seq scan.
+    q_lower = q.lower()
+    title_lower = func.lower(Movie.title)
+
+    # DB title match and TMDB search are independent — run them together
+    result, tmdb_results = await asyncio.gather(
+        db.execute(
+            select(Movie)
+            .options(selectinload(Movie.review))
+            .where(title_lower.like(f"%{q_lower}%"))
+            .order_by(
+                (title_lower == q_lower).desc(),
+                title_lower.like(f"{q_lower}%").desc(),
+                func.length(Movie.title),
+            )
+            .limit(8)
+        ),
+        tmdb_service.search(q),
     )
-    db_movies = result.unique().scalars().all()
+    db_movies = result.scalars().all()
 
     reviewed = [m for m in db_movies if m.review]
     db_match = None
     if reviewed:
         movie = reviewed[0]
-        movie_resp = MovieResponse(
-            id=movie.id,
-            tmdb_id=movie.tmdb_id,
-            title=movie.title,
-            media_type=movie.media_type,
-            overview=movie.overview,
-            poster_path=movie.poster_path,
-            backdrop_path=movie.backdrop_path,
-            genres=movie.genres,
-            release_date=movie.release_date,
-            tmdb_popularity=movie.tmdb_popularity,
-            tmdb_vote_average=movie.tmdb_vote_average,
-            poster_url=tmdb_service.get_poster_url(movie.poster_path),
-            backdrop_url=tmdb_service.get_backdrop_url(movie.backdrop_path),
-        )
-        review_resp = ReviewResponse.model_validate(movie.review)
-        db_match = MovieWithReview(movie=movie_resp, review=review_resp)
-
-    tmdb_results = await tmdb_service.search(q)
+        db_match = MovieWithReview.from_db(movie)
 
     if not tmdb_results and len(q) > 3:
         tmdb_results = await tmdb_service.search(q[:-1])
 
     if not tmdb_results and not db_match:
-        return SearchResult(
+        return ORJSONResponse(SearchResult(
             found_in_db=False,
             tmdb_results=[],
-        )
+        ))
 
-    return SearchResult(
+    # Returned directly: ORJSONResponse dumps the model itself, so FastAPI
+    # doesn't validate the whole result a second time
+    return ORJSONResponse(SearchResult(
         found_in_db=db_match is not None,
         movie=db_match,
         tmdb_results=[
@@ -181,7 +239,7 @@ async def search_movies(
             for r in tmdb_results[:8]
         ],
         generation_status=None,
-    )
+    ))
 
 
 @router.post("/generate/{tmdb_id}")
@@ -193,14 +251,11 @@ async def trigger_generation(
     db: AsyncSession = Depends(get_db),
 ):
     """Manually trigger review generation for a specific TMDB ID."""
-    result = await db.execute(
-        select(Movie)
-        .options(joinedload(Movie.review))
-        .where(Movie.tmdb_id == tmdb_id)
-    )
-    movie = result.unique().scalar_one_or_none()
-
-    if movie and movie.review:
+    # Only a boolean is needed here — don't hydrate Movie/Review rows
+    has_review = await db.scalar(lambda_stmt(
+        lambda: select(exists().where(Movie.tmdb_id == tmdb_id, Review.movie_id == Movie.id))
+    ))
+    if has_review:
         return {"status": "already_exists", "tmdb_id": tmdb_id}
 
     # Block unreleased movies
@@ -249,21 +304,23 @@ async def regenerate_review(
     # Rate limit (counts as a generation)
     await check_rate_limit(request, is_generation=True)
 
-    # Find the movie
-    result = await db.execute(
-        select(Movie)
-        .options(joinedload(Movie.review))
+    # Find the movie and whether it has a review — ids only, no row bodies
+    row = (await db.execute(
+        select(Movie.id, Movie.title, Review.id.label("review_id"))
+        .outerjoin(Review, Review.movie_id == Movie.id)
         .where(Movie.tmdb_id == tmdb_id)
-    )
-    movie = result.unique().scalar_one_or_none()
+    )).first()
 
     # Delete existing review if it exists
-    if movie and movie.review:
+    if row and row.review_id:
         await db.execute(
-            delete(Review).where(Review.movie_id == movie.id)
+            delete(Review).where(Review.movie_id == row.id)
         )
+        # Cached lists/details and the status poll drop once the delete commits,
+        # even if the regeneration below never lands
+        _invalidate_movie_caches(db, tmdb_id)
         await db.commit()
-        logger.info(f"🗑️ Deleted old review for {movie.title} (tmdb_id={tmdb_id})")
+        logger.info(f"🗑️ Deleted old review for {row.title} (tmdb_id={tmdb_id})")
 
     # Trigger fresh generation
     background_tasks.add_task(
@@ -276,11 +333,13 @@ async def regenerate_review(
 
 
 # ─── SSE STREAM ENDPOINT ────────────────────────────────────
+def _sse_event(payload: dict) -> bytes:
+    """One SSE data frame. orjson handles the review's datetimes natively."""
+    return b"data: " + orjson.dumps(payload) + b"\n\n"
+
+
 @router.get("/stream/{tmdb_id}")
-async def stream_generation_status(
-    tmdb_id: int,
-    db: AsyncSession = Depends(get_db),
-):
+async def stream_generation_status(tmdb_id: int):
     """
     Server-Sent Events stream for real-time generation progress.
     Frontend connects via EventSource. Falls back to polling if SSE fails.
@@ -288,47 +347,63 @@ async def stream_generation_status(
     async def event_generator():
         last_progress = ""
         max_wait = 120  # 2 minute timeout
-        elapsed = 0
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + max_wait
         logger.info(f"📡 SSE stream opened for tmdb_id={tmdb_id}")
 
-        while elapsed < max_wait:
-            # Check if review is completed
-            async with async_session() as check_db:
-                result = await check_db.execute(
-                    select(Movie)
-                    .options(joinedload(Movie.review))
-                    .where(Movie.tmdb_id == tmdb_id)
-                )
-                movie = result.unique().scalar_one_or_none()
-
-                if movie and movie.review:
-                    review_resp = ReviewResponse.model_validate(movie.review)
-                    logger.info(f"📡 SSE: Sending completed event for tmdb_id={tmdb_id}")
-                    yield f"data: {json.dumps({'type': 'completed', 'review': review_resp.model_dump(mode='json')})}\n\n"
-                    return
-
-            # Check progress
-            progress_data = job_progress.get(tmdb_id)
-            if progress_data:
-                if isinstance(progress_data, dict):
-                    msg = progress_data.get("message", "Processing...")
-                    pct = progress_data.get("percent", 0)
-                else:
-                    msg = str(progress_data)
-                    pct = 0
-
-                # Only send if progress changed
-                if msg != last_progress:
-                    last_progress = msg
-                    logger.info(f"📡 SSE: {msg} ({pct}%) for tmdb_id={tmdb_id}")
-                    yield f"data: {json.dumps({'type': 'progress', 'message': msg, 'percent': pct})}\n\n"
-
-            await asyncio.sleep(1)
-            elapsed += 1
+        # One session for the whole stream. It's closed after every check,
+        # which hands the connection back to the pool while we wait and
+        # expunges loaded objects so the next check reads fresh rows.
+        async with async_session() as check_db:
+            while (remaining := deadline - loop.time()) > 0:
+                # Subscribe before reading state so a change in between isn't missed
+                changed = job_progress.subscribe(tmdb_id)
+
+                # Only hit the DB when no job is running here — i.e. before it
+                # starts, or once it finished (pop + commit both notify)
+                if tmdb_id not in job_progress:
+                    # Probe for the review id only; the full review row is
+                    # read once, when it actually exists
+                    review_id = await check_db.scalar(lambda_stmt(
+                        lambda: select(Review.id)
+                        .join(Movie, Review.movie_id == Movie.id)
+                        .where(Movie.tmdb_id == tmdb_id)
+                    ))
+                    review = await check_db.get(Review, review_id) if review_id else None
+                    await check_db.close()
+
+                    if review:
+                        review_resp = ReviewResponse.from_db(review)
+                        logger.info(f"📡 SSE: Sending completed event for tmdb_id={tmdb_id}")
+                        yield _sse_event({'type': 'completed', 'review': review_resp.model_dump()})
+                        return
+
+                # Check progress
+                progress_data = job_progress.get(tmdb_id)
+                if progress_data:
+                    if isinstance(progress_data, dict):
+                        msg = progress_data.get("message", "Processing...")
+                        pct = progress_data.get("percent", 0)
+                    else:
+                        msg = str(progress_data)
+                        pct = 0
+
+                    # Only send if progress changed
+                    if msg != last_progress:
+                        last_progress = msg
+                        logger.info(f"📡 SSE: {msg} ({pct}%) for tmdb_id={tmdb_id}")
+                        yield _sse_event({'type': 'progress', 'message': msg, 'percent': pct})
+
+                # Sleep until the pipeline reports a change; the periodic wake-up
+                # doubles as a keepalive and catches jobs on other workers
+                try:
+                    await asyncio.wait_for(changed.wait(), timeout=min(SSE_WAKE_INTERVAL, remaining))
+                except asyncio.TimeoutError:
+                    yield b": keepalive\n\n"
 
         # Timeout
         logger.warning(f"📡 SSE: Timeout for tmdb_id={tmdb_id}")
-        yield f"data: {json.dumps({'type': 'error', 'message': 'Generation timed out. Please try again.'})}\n\n"
+        yield _sse_event({'type': 'error', 'message': 'Generation timed out. Please try again.'})
 
     return StreamingResponse(
         event_generator(),
@@ -347,47 +422,45 @@ async def check_generation_status(
     db: AsyncSession = Depends(get_db),
 ):
     """Poll for review generation status (fallback for SSE)."""
-    result = await db.execute(
-        select(Movie)
-        .options(joinedload(Movie.review))
-        .where(Movie.tmdb_id == tmdb_id)
-    )
-    movie = result.unique().scalar_one_or_none()
-
-    if not movie:
-        progress_data = job_progress.get(tmdb_id)
-        if progress_data:
-             if isinstance(progress_data, dict):
-                 return {"status": "generating", "progress": progress_data.get("message", "Processing..."), "percent": progress_data.get("percent", 0)}
-             return {"status": "generating", "progress": str(progress_data), "percent": 0}
-        return {"status": "not_found"}
-
-    if movie.review:
-        movie_resp = MovieResponse(
-            id=movie.id,
-            tmdb_id=movie.tmdb_id,
-            title=movie.title,
-            media_type=movie.media_type,
-            overview=movie.overview,
-            poster_path=movie.poster_path,
-            backdrop_path=movie.backdrop_path,
-            genres=movie.genres,
-            release_date=movie.release_date,
-            tmdb_popularity=movie.tmdb_popularity,
-            tmdb_vote_average=movie.tmdb_vote_average,
-            poster_url=tmdb_service.get_poster_url(movie.poster_path),
-            backdrop_url=tmdb_service.get_backdrop_url(movie.backdrop_path),
+    # A job in flight on this instance answers straight from memory
+    progress_data = job_progress.get(tmdb_id)
+    if progress_data:
+        if isinstance(progress_data, dict):
+            return {"status": "generating", "progress": progress_data.get("message", "Processing..."), "percent": progress_data.get("percent", 0)}
+        return {"status": "generating", "progress": str(progress_data), "percent": 0}
+
+    # Clients poll every second — collapse them into one DB probe per TTL
+    cache_key = f"status:{tmdb_id}"
+    cached = await cache_service.get(cache_key)
+    if cached is not None:
+        return cached
+
+    # Check existence first and only load the full rows once the review is
+    # actually there
+    # lambda_stmt: built and compiled once, only tmdb_id is re-bound per poll
+    probe = (await db.execute(lambda_stmt(
+        lambda: select(
+            Movie.id,
+            exists().where(Review.movie_id == Movie.id).label("has_review"),
         )
-        review_resp = ReviewResponse.model_validate(movie.review)
-        return {
-            "status": "completed",
-            "movie": MovieWithReview(movie=movie_resp, review=review_resp),
-        }
+        .where(Movie.tmdb_id == tmdb_id)
+    ))).first()
+
+    if not probe:
+        response = {"status": "not_found"}
+        await cache_service.set(cache_key, response, ttl=STATUS_CACHE_TTL)
+        return response
+
+    if probe.has_review:
+        movie = await db.get(Movie, probe.id, options=[selectinload(Movie.review)])
+        # Plain dict — cacheable as-is and serialized straight by orjson
+        response = {"status": "completed", "movie": movie_with_review_dict(movie)}
+        await cache_service.set(cache_key, response, ttl=STATUS_COMPLETED_CACHE_TTL)
+        return response
 
-    progress_data = job_progress.get(tmdb_id, {"message": "Preparing...", "percent": 0})
-    if isinstance(progress_data, dict):
-        return {"status": "generating", "progress": progress_data.get("message", "Processing..."), "percent": progress_data.get("percent", 0)}
-    return {"status": "generating", "progress": str(progress_data), "percent": 0}
+    response = {"status": "generating", "progress": "Preparing...", "percent": 0}
+    await cache_service.set(cache_key, response, ttl=STATUS_CACHE_TTL)
+    return response
 
 
 async def _generate_review_background(tmdb_id: int, media_type: str = "movie"):
@@ -398,6 +471,8 @@ async def _generate_review_background(tmdb_id: int, media_type: str = "movie"):
                 movie = await get_or_create_movie(db, tmdb_id, media_type)
                 await generate_review_for_movie(db, movie)
                 await db.commit()
+                # Review is now visible — wake SSE streams waiting on it
+                job_progress.notify(tmdb_id)
             except Exception as e:
                 await db.rollback()
                 logger.error(f"Background generation failed for {tmdb_id}: {e}")
@@ -3,15 +3,25 @@ Worth the Watch? — Versus Router
 AI-powered 1v1 movie battles with witty comparisons.
 """
 
-import json
+import re
+import asyncio
 import logging
+from collections import OrderedDict
+
+import orjson
 from fastapi import APIRouter, Depends, Request, HTTPException, Query
-from sqlalchemy import select
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select, case, func
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import joinedload
 
-from app.database import get_db
+from app.database import get_db, async_session
 from app.models import Movie, Review, BattleCache
+from app.services.cache import cache_service
+from app.services.llm import (
+    llm_client, llm_model, openai_client, openai_model, deepseek_client, deepseek_model,
+    sanitize_text, sanitize_many,
+)
+from app.services.pipeline import build_context_snippet, CONTEXT_EXCERPT_CHARS
 from app.services.tmdb import tmdb_service
 from app.middleware.rate_limit import check_rate_limit
 
@@ -19,6 +29,14 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+# Battles are stored permanently in BattleCache; this bounds how long a
+# pair's result also stays in the fast cache in front of it
+BATTLE_CACHE_TTL = 60 * 60
+
+# Per-movie prompt context, by row version (see _build_movie_context)
+CONTEXT_CACHE_MAX = 4096
+_context_cache: OrderedDict[tuple, str] = OrderedDict()
+
 
 # ─── Battle Prompt ────────────────────────────────────────
 
@@ -72,10 +90,17 @@ OUTPUT FORMAT (strict JSON, no markdown fences):
 }"""
 
 
+# Sent byte-identical on every call, always first, so the provider's prompt
+# prefix cache can reuse it: DeepSeek caches shared prefixes automatically,
+# OpenAI routes on prompt_cache_key. Nothing per-request goes in here.
+_VERSUS_SYSTEM_MESSAGE = {"role": "system", "content": VERSUS_SYSTEM_PROMPT}
+VERSUS_PROMPT_CACHE_KEY = "versus_v1"
+
+
 # ─── Helper Functions ─────────────────────────────────────
 
-def _build_movie_context(movie_data: dict, review_data: dict | None, label: str) -> str:
-    """Build a rich context string for one movie."""
+def _movie_context_body(movie_data: dict, review_data: dict | None) -> str:
+    """Build a rich context string for one movie, minus its MOVIE A/B label."""
     title = movie_data.get("title", "Unknown")
     year = ""
     release = movie_data.get("release_date")
@@ -90,26 +115,24 @@ def _build_movie_context(movie_data: dict, review_data: dict | None, label: str)
     
     overview = movie_data.get("overview", "No overview available.")
     
-    context = f"""MOVIE {label}: {title} ({year})
+    context = f"""{title} ({year})
 Genre: {genres}
 Overview: {overview}"""
     
     if review_data:
-        verdict = review_data.get("verdict", "")
-        hook = review_data.get("hook", "")
         imdb = review_data.get("imdb_score")
         rt = review_data.get("rt_critic_score")
-        review_text = review_data.get("review_text", "")
         
-        context += f"\nOur Verdict: {verdict}"
-        if hook:
-            context += f"\nHook: {hook}"
+        # Precomputed at review time; rebuilt only for rows written before it existed
+        snippet = review_data.get("context_snippet") or build_context_snippet(
+            review_data.get("verdict", ""), review_data.get("hook", ""), review_data.get("review_text", "")
+        )
+        context += f"\n{snippet}"
+        # Scores are refreshed independently of the review, so they stay live
         if imdb:
             context += f"\nIMDb: {imdb}/10"
         if rt:
             context += f"\nRotten Tomatoes: {rt}%"
-        if review_text:
-            context += f"\nReview excerpt: {review_text[:500]}"
     else:
         tmdb_score = movie_data.get("tmdb_vote_average")
         if tmdb_score:
@@ -119,65 +142,183 @@ Overview: {overview}"""
     return context
 
 
-async def _get_movie_data(db: AsyncSession, tmdb_id: int, media_type: str = "movie") -> tuple[dict, dict | None]:
+def _build_movie_context(movie_data: dict, review_data: dict | None, label: str) -> str:
     """
-    Fetch movie data + review from DB. If not in DB, fetch from TMDB.
-    Uses media_type to query the correct TMDB endpoint (movie vs tv).
-    This prevents TMDB ID collisions (e.g. Doraemon TV #57911 vs Harry and the Butler movie #57911).
-    Returns (movie_data_dict, review_data_dict_or_None)
+    Context string for one side of a battle.
+    Popular titles show up in battle after battle against different opponents,
+    so bodies of DB-backed movies are kept in an LRU keyed by the row versions
+    (see _movie_to_data) — any write to the movie or its review yields a new key.
     """
-    # Try DB first — filter by media_type to avoid collisions
-    result = await db.execute(
-        select(Movie).options(joinedload(Movie.review)).where(
-            Movie.tmdb_id == tmdb_id,
-            Movie.media_type == media_type,
-        )
+    version = movie_data.get("context_version")
+    body = _context_cache.get(version) if version else None
+    if body is None:
+        body = _movie_context_body(movie_data, review_data)
+        if version:
+            _context_cache[version] = body
+            if len(_context_cache) > CONTEXT_CACHE_MAX:
+                _context_cache.popitem(last=False)
+    else:
+        _context_cache.move_to_end(version)
+    return f"MOVIE {label}: {body}"
+
+
+# Exact output shape for providers with structured outputs (OpenAI). The
+# sampler can then only produce valid battle JSON, so there's no stray
+# prose or markdown to pay for or parse around. DeepSeek only has JSON mode
+# and relies on the OUTPUT FORMAT section of the prompt.
+_BATTLE_REASONS_SCHEMA = {"type": "array", "items": {"type": "string"}}
+BATTLE_RESPONSE_FORMAT = {
+    "type": "json_schema",
+    "json_schema": {
+        "name": "battle_result",
+        "strict": True,
+        "schema": {
+            "type": "object",
+            "properties": {
+                "winner": {"type": "string", "enum": ["a", "b"]},
+                "kill_reason": {"type": "string"},
+                "winner_reasons": _BATTLE_REASONS_SCHEMA,
+                "loser_reasons": _BATTLE_REASONS_SCHEMA,
+                "winner_headline": {"type": "string"},
+                "loser_headline": {"type": "string"},
+            },
+            "required": [
+                "winner", "kill_reason", "winner_reasons", "loser_reasons",
+                "winner_headline", "loser_headline",
+            ],
+            "additionalProperties": False,
+        },
+    },
+}
+
+
+def _battle_request(client, model: str, user_prompt: str) -> dict:
+    """chat.completions.create kwargs shared by the plain and streamed battle calls."""
+    is_openai = client is openai_client
+    return {
+        "model": model,
+        "messages": [
+            _VERSUS_SYSTEM_MESSAGE,
+            {"role": "user", "content": user_prompt},
+        ],
+        "response_format": BATTLE_RESPONSE_FORMAT if is_openai else {"type": "json_object"},
+        "temperature": 0.7,
+        "max_tokens": 500,
+        "timeout": 30.0,
+        "extra_body": {"prompt_cache_key": VERSUS_PROMPT_CACHE_KEY} if is_openai else None,
+    }
+
+
+async def _call_battle_llm(client, model: str, user_prompt: str) -> str:
+    response = await client.chat.completions.create(**_battle_request(client, model, user_prompt))
+    return response.choices[0].message.content
+
+
+# The first fields of the battle JSON, readable long before the rest of it
+# has been generated. Values are matched only once their closing quote arrives.
+_PREVIEW_WINNER_RE = re.compile(r'"winner"\s*:\s*"([ab])"')
+_PREVIEW_KILL_RE = re.compile(r'"kill_reason"\s*:\s*"((?:[^"\\]|\\.)*)"')
+
+
+def _parse_preview(partial: str) -> dict | None:
+    """Pull winner + kill_reason out of a partially generated battle JSON, if both are complete."""
+    winner = _PREVIEW_WINNER_RE.search(partial)
+    kill = _PREVIEW_KILL_RE.search(partial)
+    if not winner or not kill:
+        return None
+    try:
+        kill_reason = orjson.loads(f'"{kill.group(1)}"')
+    except orjson.JSONDecodeError:
+        return None
+    return {"winner": winner.group(1), "kill_reason": kill_reason}
+
+
+async def _stream_battle_llm(client, model: str, user_prompt: str, on_preview) -> str:
+    """_call_battle_llm, streamed: on_preview is called once winner + kill_reason are in."""
+    stream = await client.chat.completions.create(
+        **_battle_request(client, model, user_prompt), stream=True
     )
-    movie = result.unique().scalar_one_or_none()
-    
-    # Fallback: try DB without media_type filter (in case it was stored differently)
-    if not movie:
-        result = await db.execute(
-            select(Movie).options(joinedload(Movie.review)).where(Movie.tmdb_id == tmdb_id)
-        )
-        movies = result.unique().scalars().all()
-        if movies:
-            # Prefer the one with a review
-            reviewed = [m for m in movies if m.review]
-            movie = reviewed[0] if reviewed else movies[0]
-    
-    if movie:
-        movie_data = {
-            "title": movie.title,
-            "release_date": movie.release_date,
-            "genres": movie.genres,
-            "overview": movie.overview,
-            "poster_path": movie.poster_path,
-            "backdrop_path": movie.backdrop_path,
-            "tmdb_vote_average": movie.tmdb_vote_average,
-            "media_type": movie.media_type,
+    buf = ""
+    previewed = False
+    async for chunk in stream:
+        if not chunk.choices or not chunk.choices[0].delta.content:
+            continue
+        buf += chunk.choices[0].delta.content
+        # Nothing to match until the kill_reason key is in (winner comes first)
+        if not previewed and '"kill_reason"' in buf:
+            preview = _parse_preview(buf)
+            if preview:
+                on_preview(preview)
+                previewed = True
+    return buf
+
+
+# Only what _build_movie_context and the battle response read. review_text
+# is only needed when there's no context_snippet yet, and is cut down by
+# Postgres so the full review never leaves the DB
+_BATTLE_MOVIE_COLUMNS = (
+    Movie.tmdb_id,
+    Movie.title,
+    Movie.release_date,
+    Movie.genres,
+    Movie.overview,
+    Movie.poster_path,
+    Movie.backdrop_path,
+    Movie.tmdb_vote_average,
+    Movie.media_type,
+    Movie.updated_at,
+    Review.id.label("review_id"),
+    Review.generated_at,
+    Review.last_refreshed_at,
+    Review.verdict,
+    Review.hook,
+    Review.context_snippet,
+    case(
+        (Review.context_snippet.is_(None), func.substr(Review.review_text, 1, CONTEXT_EXCERPT_CHARS)),
+    ).label("review_text"),
+    Review.imdb_score,
+    Review.rt_critic_score,
+)
+
+
+def _movie_to_data(row) -> tuple[dict, dict | None]:
+    """Split a battle movie row into (movie_data_dict, review_data_dict_or_None)."""
+    movie_data = {
+        "title": row.title,
+        "release_date": row.release_date,
+        "genres": row.genres,
+        "overview": row.overview,
+        "poster_path": row.poster_path,
+        "backdrop_path": row.backdrop_path,
+        "tmdb_vote_average": row.tmdb_vote_average,
+        "media_type": row.media_type,
+        "context_version": (
+            row.tmdb_id, row.updated_at, row.review_id, row.generated_at, row.last_refreshed_at
+        ),
+    }
+    review_data = None
+    if row.review_id is not None:
+        review_data = {
+            "verdict": row.verdict,
+            "hook": row.hook,
+            "review_text": row.review_text,
+            "context_snippet": row.context_snippet,
+            "imdb_score": row.imdb_score,
+            "rt_critic_score": row.rt_critic_score,
         }
-        review_data = None
-        if movie.review:
-            review_data = {
-                "verdict": movie.review.verdict,
-                "hook": movie.review.hook,
-                "review_text": movie.review.review_text,
-                "imdb_score": movie.review.imdb_score,
-                "rt_critic_score": movie.review.rt_critic_score,
-            }
-        return movie_data, review_data
-    
-    # Not in DB — fetch from TMDB using the correct type FIRST
-    tmdb_data = None
+    return movie_data, review_data
+
+
+async def _get_tmdb_data(tmdb_id: int, media_type: str = "movie") -> tuple[dict, dict | None]:
+    """
+    Fetch a title that isn't in our DB from TMDB, from the media_type endpoint only.
+    The other endpoint is never tried: the same ID there is a different title
+    (e.g. Doraemon TV #57911 vs Harry and the Butler movie #57911).
+    """
     if media_type == "tv":
         tmdb_data = await tmdb_service.get_tv_details(tmdb_id)
-        if not tmdb_data or not tmdb_data.get("id"):
-            tmdb_data = await tmdb_service.get_movie_details(tmdb_id)
     else:
         tmdb_data = await tmdb_service.get_movie_details(tmdb_id)
-        if not tmdb_data or not tmdb_data.get("id"):
-            tmdb_data = await tmdb_service.get_tv_details(tmdb_id)
     
     if not tmdb_data or not tmdb_data.get("id"):
         return {}, None
@@ -186,12 +327,99 @@ async def _get_movie_data(db: AsyncSession, tmdb_id: int, media_type: str = "mov
     return normalized, None
 
 
+async def _get_two_movies(
+    db: AsyncSession, a_id: int, a_type: str, b_id: int, b_type: str
+) -> tuple[tuple[dict, dict | None], tuple[dict, dict | None]]:
+    """
+    Fetch both contestants (movie data + review) in one DB round trip.
+    A DB row only counts if its media_type matches the requested one: with
+    tmdb_id unique in movies, a row of the other type is a different title
+    that happens to share the ID. Anything not in the DB is fetched from
+    TMDB, in parallel.
+    Returns ((movie_a_data, review_a), (movie_b_data, review_b))
+    """
+    result = await db.execute(
+        select(*_BATTLE_MOVIE_COLUMNS)
+        .outerjoin(Review, Review.movie_id == Movie.id)
+        .where(Movie.tmdb_id.in_((a_id, b_id)))
+    )
+    found = {(row.tmdb_id, row.media_type): _movie_to_data(row) for row in result}
+    
+    sides = [(a_id, a_type), (b_id, b_type)]
+    missing = [side for side in sides if side not in found]
+    fetched = dict(zip(missing, await asyncio.gather(*(_get_tmdb_data(*side) for side in missing))))
+    
+    return tuple(found.get(side) or fetched[side] for side in sides)
+
+
 # ─── Battle Endpoint ──────────────────────────────────────
 
+# Pending BattleCache writes, referenced so they aren't garbage collected mid-insert
+_persist_tasks: set[asyncio.Task] = set()
+
+
+async def _persist_battle(cache_a: int, cache_b: int, result: dict, used_model: str):
+    """Store a generated battle in BattleCache. Runs in the background with its own session."""
+    try:
+        async with async_session() as db:
+            db.add(BattleCache(
+                movie_a_id=cache_a,
+                movie_b_id=cache_b,
+                winner_id=result["winner_id"],
+                loser_id=result["loser_id"],
+                winner_title=result["winner_title"],
+                loser_title=result["loser_title"],
+                kill_reason=result["kill_reason"],
+                breakdown=result["breakdown"],
+                winner_headline=result["winner_headline"],
+                loser_headline=result["loser_headline"],
+                result_json=result,
+                llm_model=used_model,
+            ))
+            await db.commit()
+        logger.info(f"💾 Cached battle: {cache_a} vs {cache_b}")
+    except Exception as cache_err:
+        logger.warning(f"Failed to cache battle result: {cache_err}")
+
+
+# Uncached battles being generated, by (cache_a, cache_b): a second request
+# for the same pair awaits the first one's LLM call instead of starting its own
+_inflight: dict[tuple[int, int], asyncio.Task] = {}
+
+
+def _pair_keys(movie_a_id: int, movie_b_id: int) -> tuple[int, int, str]:
+    """(cache_a, cache_b, mem_key) for a pair — the smaller tmdb_id is always cache_a."""
+    cache_a = min(movie_a_id, movie_b_id)
+    cache_b = max(movie_a_id, movie_b_id)
+    return cache_a, cache_b, f"versus:battle:{cache_a}:{cache_b}"
+
+
+async def _get_cached_battle(db: AsyncSession, movie_a_id: int, movie_b_id: int) -> dict | None:
+    """A stored battle for this pair, from the fast cache or else BattleCache."""
+    cache_a, cache_b, mem_key = _pair_keys(movie_a_id, movie_b_id)
+    
+    # Hot pairs are answered from memory/Redis without touching Postgres
+    mem_cached = await cache_service.get(mem_key)
+    if mem_cached is not None:
+        return mem_cached
+    
+    # Only the stored payload is needed; idx_battle_cache_pair makes this a
+    # single unique-index probe
+    cached_result = await db.scalar(
+        select(BattleCache.result_json).where(
+            BattleCache.movie_a_id == cache_a,
+            BattleCache.movie_b_id == cache_b,
+        )
+    )
+    if cached_result:
+        await cache_service.set(mem_key, cached_result, ttl=BATTLE_CACHE_TTL)
+    return cached_result
+
+
 @router.post("/battle")
 async def battle(
-    movie_a_id: int = Query(..., description="TMDB ID of movie A"),
-    movie_b_id: int = Query(..., description="TMDB ID of movie B"),
+    movie_a_id: int = Query(..., gt=0, description="TMDB ID of movie A"),
+    movie_b_id: int = Query(..., gt=0, description="TMDB ID of movie B"),
     movie_a_type: str = Query("movie", pattern="^(movie|tv)$", description="Media type of movie A"),
     movie_b_type: str = Query("movie", pattern="^(movie|tv)$", description="Media type of movie B"),
     request: Request = None,
@@ -209,33 +437,83 @@ async def battle(
     if movie_a_id == movie_b_id and movie_a_type == movie_b_type:
         raise HTTPException(status_code=400, detail="Cannot battle a movie against itself")
     
-    # Rate limit (same as review generation)
-    await check_rate_limit(request, is_generation=True)
-    
     logger.info(f"⚔️ Versus battle: {movie_a_id} ({movie_a_type}) vs {movie_b_id} ({movie_b_type})")
     
     # ── Check cache first ──
-    # Include media types in cache key to differentiate TV vs movie with same ID
-    cache_key_a = f"{min(movie_a_id, movie_b_id)}"
-    cache_key_b = f"{max(movie_a_id, movie_b_id)}"
-    cache_a = min(movie_a_id, movie_b_id)
-    cache_b = max(movie_a_id, movie_b_id)
+    # Cached battles cost no LLM call, so they don't use up generation quota
+    cached_result = await _get_cached_battle(db, movie_a_id, movie_b_id)
+    if cached_result:
+        logger.info(f"⚡ Cache hit for battle: {movie_a_id} vs {movie_b_id}")
+        return cached_result
     
-    cached = await db.execute(
-        select(BattleCache).where(
-            BattleCache.movie_a_id == cache_a,
-            BattleCache.movie_b_id == cache_b,
-        )
-    )
-    cached_battle = cached.scalar_one_or_none()
+    # Rate limit (same as review generation)
+    await check_rate_limit(request, is_generation=True)
     
-    if cached_battle and cached_battle.result_json:
-        logger.info(f"⚡ Cache hit for battle: {movie_a_id} vs {movie_b_id}")
-        return cached_battle.result_json
+    return await run_battle(movie_a_id, movie_a_type, movie_b_id, movie_b_type)
+
+
+async def run_battle(movie_a_id: int, movie_a_type: str, movie_b_id: int, movie_b_type: str) -> dict:
+    """
+    Generate (and store) a battle without checking the caches first.
+    Concurrent calls for the same pair share one generation (see _inflight).
+    Used by /battle after a cache miss and by the battle prewarm job.
+    """
+    task, _ = _start_battle(movie_a_id, movie_a_type, movie_b_id, movie_b_type)
+    # shield: one client disconnecting must not cancel the shared LLM call
+    return await asyncio.shield(task)
+
+
+def _start_battle(
+    movie_a_id: int,
+    movie_a_type: str,
+    movie_b_id: int,
+    movie_b_type: str,
+    events: asyncio.Queue | None = None,
+) -> tuple[asyncio.Task, bool]:
+    """
+    The generation task for this pair: the one already in flight, or a new one.
+    Returns (task, started) — events only reach _generate_battle when started.
+    """
+    cache_a, cache_b, mem_key = _pair_keys(movie_a_id, movie_b_id)
+    key = (cache_a, cache_b)
+    task = _inflight.get(key)
+    if task is not None:
+        logger.info(f"⏳ Joining in-flight battle: {movie_a_id} vs {movie_b_id}")
+        return task, False
     
+    task = asyncio.ensure_future(
+        _generate_battle(
+            movie_a_id, movie_a_type, movie_b_id, movie_b_type, cache_a, cache_b, mem_key, events
+        )
+    )
+    _inflight[key] = task
+    task.add_done_callback(lambda _: _inflight.pop(key, None))
+    return task, True
+
+
+async def _generate_battle(
+    movie_a_id: int,
+    movie_a_type: str,
+    movie_b_id: int,
+    movie_b_type: str,
+    cache_a: int,
+    cache_b: int,
+    mem_key: str,
+    events: asyncio.Queue | None = None,
+) -> dict:
+    """
+    Run an uncached battle: fetch both titles, call the LLM, store the result.
+    Runs as a shared task (see _inflight), so it uses its own short-lived
+    sessions instead of the first caller's, and holds no connection during
+    the LLM call.
+    With events, the primary LLM call is streamed and the winner + kill_reason
+    are put on the queue as soon as they've been generated (see /battle/stream).
+    """
     # ── Fetch both movies' data with correct media types ──
-    movie_a_data, review_a = await _get_movie_data(db, movie_a_id, movie_a_type)
-    movie_b_data, review_b = await _get_movie_data(db, movie_b_id, movie_b_type)
+    async with async_session() as db:
+        (movie_a_data, review_a), (movie_b_data, review_b) = await _get_two_movies(
+            db, movie_a_id, movie_a_type, movie_b_id, movie_b_type
+        )
     
     if not movie_a_data.get("title") or not movie_b_data.get("title"):
         raise HTTPException(status_code=404, detail="One or both movies not found")
@@ -253,45 +531,35 @@ These two titles are going head-to-head. Analyze everything — story, performan
 Remember: The kill_reason needs to be ONE sentence so clever and funny that people will screenshot it. Reference something specific about BOTH movies."""
     
     # Call LLM
-    from openai import AsyncOpenAI
-    from app.services.llm import llm_client, llm_model, openai_client, openai_model, deepseek_client, deepseek_model, sanitize_text
-    
     content = None
     used_model = llm_model
+    previewed = False
     try:
         logger.info(f"🧠 Versus LLM call: {llm_model}")
-        response = await llm_client.chat.completions.create(
-            model=llm_model,
-            messages=[
-                {"role": "system", "content": VERSUS_SYSTEM_PROMPT},
-                {"role": "user", "content": user_prompt},
-            ],
-            response_format={"type": "json_object"},
-            temperature=0.7,
-            max_tokens=500,
-            timeout=30.0,
-        )
-        content = response.choices[0].message.content
+        if events is not None:
+            def on_preview(preview: dict):
+                nonlocal previewed
+                previewed = True
+                events.put_nowait({
+                    "type": "preview",
+                    "winner_id": movie_a_id if preview["winner"] == "a" else movie_b_id,
+                    "kill_reason": sanitize_text(preview["kill_reason"]),
+                })
+            content = await _stream_battle_llm(llm_client, llm_model, user_prompt, on_preview)
+        else:
+            content = await _call_battle_llm(llm_client, llm_model, user_prompt)
     except Exception as e:
         logger.warning(f"Primary LLM failed for versus: {e}")
+        if previewed:
+            # The fallback model picks its own winner — withdraw the preview
+            events.put_nowait({"type": "reset"})
         fallback_client = openai_client if llm_client != openai_client else deepseek_client
         fallback_model = openai_model if llm_client != openai_client else deepseek_model
         
         if fallback_client:
             try:
                 used_model = fallback_model
-                response = await fallback_client.chat.completions.create(
-                    model=fallback_model,
-                    messages=[
-                        {"role": "system", "content": VERSUS_SYSTEM_PROMPT},
-                        {"role": "user", "content": user_prompt},
-                    ],
-                    response_format={"type": "json_object"},
-                    temperature=0.7,
-                    max_tokens=500,
-                    timeout=30.0,
-                )
-                content = response.choices[0].message.content
+                content = await _call_battle_llm(fallback_client, fallback_model, user_prompt)
             except Exception as fallback_error:
                 logger.error(f"Fallback LLM also failed for versus: {fallback_error}")
                 raise HTTPException(status_code=503, detail="AI battle generation failed")
@@ -300,7 +568,7 @@ Remember: The kill_reason needs to be ONE sentence so clever and funny that peop
     
     # Parse response
     try:
-        data = json.loads(content)
+        data = orjson.loads(content)
         
         winner_id = movie_a_id if data.get("winner") == "a" else movie_b_id
         loser_id = movie_b_id if winner_id == movie_a_id else movie_a_id
@@ -315,8 +583,8 @@ Remember: The kill_reason needs to be ONE sentence so clever and funny that peop
             "winner_title": winner_data.get("title", ""),
             "loser_title": loser_data.get("title", ""),
             "kill_reason": sanitize_text(data.get("kill_reason", "")),
-            "winner_reasons": [sanitize_text(r) for r in data.get("winner_reasons", [])],
-            "loser_reasons": [sanitize_text(r) for r in data.get("loser_reasons", [])],
+            "winner_reasons": sanitize_many(data.get("winner_reasons")),
+            "loser_reasons": sanitize_many(data.get("loser_reasons")),
             "breakdown": sanitize_text(data.get("breakdown", "")),
             "winner_headline": data.get("winner_headline", "The Winner"),
             "loser_headline": data.get("loser_headline", "Good Try"),
@@ -325,7 +593,7 @@ Remember: The kill_reason needs to be ONE sentence so clever and funny that peop
                 "title": movie_a_data.get("title", ""),
                 "poster_path": movie_a_data.get("poster_path"),
                 "backdrop_path": movie_a_data.get("backdrop_path"),
-                "release_date": str(movie_a_data.get("release_date", "")),
+                "release_date": str(movie_a_data.get("release_date") or ""),
                 "tmdb_vote_average": movie_a_data.get("tmdb_vote_average"),
                 "media_type": movie_a_type,
                 "verdict": review_a.get("verdict") if review_a else None,
@@ -336,7 +604,7 @@ Remember: The kill_reason needs to be ONE sentence so clever and funny that peop
                 "title": movie_b_data.get("title", ""),
                 "poster_path": movie_b_data.get("poster_path"),
                 "backdrop_path": movie_b_data.get("backdrop_path"),
-                "release_date": str(movie_b_data.get("release_date", "")),
+                "release_date": str(movie_b_data.get("release_date") or ""),
                 "tmdb_vote_average": movie_b_data.get("tmdb_vote_average"),
                 "media_type": movie_b_type,
                 "verdict": review_b.get("verdict") if review_b else None,
@@ -345,31 +613,96 @@ Remember: The kill_reason needs to be ONE sentence so clever and funny that peop
         }
         
         # ── Save to cache ──
-        try:
-            new_cache = BattleCache(
-                movie_a_id=cache_a,
-                movie_b_id=cache_b,
-                winner_id=winner_id,
-                loser_id=loser_id,
-                winner_title=result["winner_title"],
-                loser_title=result["loser_title"],
-                kill_reason=result["kill_reason"],
-                breakdown=result["breakdown"],
-                winner_headline=result["winner_headline"],
-                loser_headline=result["loser_headline"],
-                result_json=result,
-                llm_model=used_model,
-            )
-            db.add(new_cache)
-            await db.commit()
-            logger.info(f"💾 Cached battle: {cache_a} vs {cache_b}")
-        except Exception as cache_err:
-            logger.warning(f"Failed to cache battle result: {cache_err}")
-            await db.rollback()
+        # The fast cache answers repeats right away; the permanent BattleCache
+        # row is written off the response path
+        await cache_service.set(mem_key, result, ttl=BATTLE_CACHE_TTL)
+        task = asyncio.create_task(_persist_battle(cache_a, cache_b, result, used_model))
+        _persist_tasks.add(task)
+        task.add_done_callback(_persist_tasks.discard)
         
         logger.info(f"⚔️ Battle result: {winner_data.get('title')} defeats {loser_data.get('title')}")
         return result
         
-    except (json.JSONDecodeError, Exception) as e:
+    except (orjson.JSONDecodeError, Exception) as e:
         logger.error(f"Failed to parse versus result: {e}")
-        raise HTTPException(status_code=500, detail="Battle result parsing failed")
\ No newline at end of file
+        raise HTTPException(status_code=500, detail="Battle result parsing failed")
+
+
+def _sse_event(payload: dict) -> bytes:
+    """One SSE data frame."""
+    return b"data: " + orjson.dumps(payload) + b"\n\n"
+
+
+@router.get("/battle/stream")
+async def battle_stream(
+    movie_a_id: int = Query(..., gt=0, description="TMDB ID of movie A"),
+    movie_b_id: int = Query(..., gt=0, description="TMDB ID of movie B"),
+    movie_a_type: str = Query("movie", pattern="^(movie|tv)$", description="Media type of movie A"),
+    movie_b_type: str = Query("movie", pattern="^(movie|tv)$", description="Media type of movie B"),
+    request: Request = None,
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    /battle over Server-Sent Events, for clients that want the verdict early.
+    On an uncached battle a {"type": "preview", "winner_id", "kill_reason"} event
+    is sent as soon as the LLM has written those fields, then
+    {"type": "completed", "battle": <same body as /battle>} once it's done.
+    If the streamed call fails after the preview and the fallback model takes
+    over, {"type": "reset"} comes first: drop the preview, the fallback may
+    crown the other title.
+    Errors arrive as {"type": "error", "message": ...}.
+    """
+    if movie_a_id == movie_b_id and movie_a_type == movie_b_type:
+        raise HTTPException(status_code=400, detail="Cannot battle a movie against itself")
+    
+    cached_result = await _get_cached_battle(db, movie_a_id, movie_b_id)
+    if not cached_result:
+        await check_rate_limit(request, is_generation=True)
+    
+    # Only the request that starts the generation gets previews; anyone
+    # joining an in-flight battle just waits for the result
+    events = None
+    task = None
+    if not cached_result:
+        events = asyncio.Queue()
+        task, started = _start_battle(movie_a_id, movie_a_type, movie_b_id, movie_b_type, events)
+        if not started:
+            events = None
+    
+    async def event_generator():
+        if task is None:
+            yield _sse_event({"type": "completed", "battle": cached_result})
+            return
+        
+        if events is not None:
+            while not task.done():
+                getter = asyncio.ensure_future(events.get())
+                await asyncio.wait({getter, task}, return_when=asyncio.FIRST_COMPLETED)
+                if getter.done():
+                    yield _sse_event(getter.result())
+                else:
+                    getter.cancel()
+            # Events queued in the same tick the task finished (e.g. a reset)
+            while not events.empty():
+                yield _sse_event(events.get_nowait())
+        
+        try:
+            # shield: the client going away must not cancel the shared generation
+            result = await asyncio.shield(task)
+        except HTTPException as e:
+            yield _sse_event({"type": "error", "message": e.detail})
+            return
+        except Exception as e:
+            logger.error(f"Streamed battle failed: {e}")
+            yield _sse_event({"type": "error", "message": "Battle failed"})
+            return
+        yield _sse_event({"type": "completed", "battle": result})
+    
+    return StreamingResponse(
+        event_generator(),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "Connection": "keep-alive",
+        },
+    )
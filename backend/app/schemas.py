@@ -4,6 +4,7 @@ Separate from SQLAlchemy models. Handles API validation & serialization.
 """
 
 from datetime import date, datetime
+from operator import attrgetter
 from pydantic import BaseModel, Field, field_validator
 from typing import Optional
 
@@ -20,24 +21,11 @@ class MovieBase(BaseModel):
     poster_url: Optional[str] = None
     backdrop_url: Optional[str] = None
     genres: Optional[list[dict]] = None
+    # Parsed once on ingest (tmdb.parse_iso_date, or a Date column)
     release_date: Optional[date] = None
     tmdb_popularity: Optional[float] = None
     tmdb_vote_average: Optional[float] = None
 
-    @field_validator("release_date", mode="before")
-    @classmethod
-    def parse_release_date(cls, v):
-        """Handle TMDB returning dates as strings or empty strings."""
-        if v is None or v == "":
-            return None
-        if isinstance(v, date):
-            return v
-        if isinstance(v, str):
-            try:
-                return date.fromisoformat(v)
-            except (ValueError, TypeError):
-                return None
-        return None
 
 
 class MovieResponse(MovieBase):
@@ -47,6 +35,11 @@ class MovieResponse(MovieBase):
 
     model_config = {"from_attributes": True}
 
+    @classmethod
+    def from_db(cls, movie) -> "MovieResponse":
+        """From a Movie row (see DB Row → Response below)."""
+        return cls.model_validate(movie)
+
 
 # ─── Review Schemas ───────────────────────────────────────
 
@@ -88,11 +81,44 @@ class ReviewResponse(BaseModel):
 
     model_config = {"from_attributes": True}
 
+    @classmethod
+    def from_db(cls, review) -> "ReviewResponse":
+        """From a Review row (see DB Row → Response below)."""
+        return cls.model_validate(review)
+
 
 class MovieWithReview(BaseModel):
     movie: MovieResponse
     review: Optional[ReviewResponse] = None
 
+    @classmethod
+    def from_db(cls, movie) -> "MovieWithReview":
+        """From a Movie row with its review loaded, in one validation call."""
+        return cls.model_validate({"movie": movie, "review": movie.review}, from_attributes=True)
+
+
+# ─── DB Row → Response ────────────────────────────────────
+# Pydantic objects are built from rows with the from_db classmethods above.
+# They go through from_attributes validation rather than model_construct():
+# pydantic-core validates these models about 2x faster than model_construct()
+# builds them in Python. Endpoints that don't need a model at all use the
+# plain dicts below. Field getters are resolved once at import.
+
+_MOVIE_FIELDS = tuple(MovieResponse.model_fields)
+_get_movie_fields = attrgetter(*_MOVIE_FIELDS)
+_REVIEW_FIELDS = tuple(ReviewResponse.model_fields)
+_get_review_fields = attrgetter(*_REVIEW_FIELDS)
+
+
+def movie_with_review_dict(movie) -> dict:
+    """MovieWithReview-shaped plain dict, for endpoints that skip Pydantic."""
+    review = movie.review
+    return {
+        "movie": dict(zip(_MOVIE_FIELDS, _get_movie_fields(movie))),
+        "review": dict(zip(_REVIEW_FIELDS, _get_review_fields(review))) if review else None,
+    }
+
+
 
 # ─── LLM Output Schema ───────────────────────────────────
 
@@ -104,6 +130,10 @@ ALLOWED_TAGS = {
     "Mind-Bending", "Dialogue-Heavy", "Visual-Masterpiece",
     "Emotional", "Heartbreaking",
 }
+# Lowercased, hyphenated form -> canonical tag; "fast paced", "FAST-PACED"
+# and "Fast-Paced" all land on one key
+_TAG_LOOKUP = {tag.lower(): tag for tag in ALLOWED_TAGS}
+MAX_TAGS = 5
 
 class LLMReviewOutput(BaseModel):
     """Expected JSON output from the LLM synthesis step."""
@@ -136,13 +166,15 @@ class LLMReviewOutput(BaseModel):
     @field_validator('tags', mode='after')
     @classmethod
     def validate_tags(cls, v):
-        # Title case and filter based on ALLOWED_TAGS
+        # Map onto ALLOWED_TAGS, dropping unknowns and repeats
         clean_tags = []
         for tag in v:
-            normalized = tag.strip().title().replace(" ", "-")
-            if normalized in ALLOWED_TAGS:
-                clean_tags.append(normalized)
-        return clean_tags[:5]  # Max 5 tags
+            canonical = _TAG_LOOKUP.get(tag.strip().lower().replace(" ", "-"))
+            if canonical and canonical not in clean_tags:
+                clean_tags.append(canonical)
+                if len(clean_tags) == MAX_TAGS:
+                    break
+        return clean_tags
 
 
 # ─── API Response Wrappers ────────────────────────────────
@@ -6,6 +6,7 @@ Uses a StateGraph for adaptive review generation with conditional routing.
 Enable via: USE_LANGGRAPH=true in .env
 """
 
+import asyncio
 import logging
 from typing import TypedDict, Optional, Literal
 
@@ -73,40 +74,40 @@ async def search_sources(state: AgentState) -> dict:
     
     logger.info(f"🔍 Agent: Searching for reviews of '{title}'")
     
-    results = []
+    # All five searches are independent — run them concurrently
+    search_results = await asyncio.gather(
+        serper_service.search_reviews(title, year, media_type),
+        serper_service.search_reddit(title, year, media_type),
+        serper_service.search_forums(title, year, media_type),
+        guardian_service.search_film_reviews(title, year),
+        nyt_service.search_reviews(title),
+        return_exceptions=True,
+    )
+    sources = ("Serper critic", "Serper Reddit", "Serper forum", "Guardian", "NYT")
+    for source, outcome in zip(sources, search_results):
+        if isinstance(outcome, Exception):
+            logger.warning(f"{source} search failed: {outcome}")
+    critic_results, reddit_results, forum_results, guardian_articles, nyt_reviews = (
+        [] if isinstance(outcome, Exception) else outcome for outcome in search_results
+    )
     
-    # Serper search (critic + Reddit + forums)
-    try:
-        critic_results = await serper_service.search_reviews(title, year, media_type)
-        reddit_results = await serper_service.search_reddit(title, year, media_type)
-        forum_results = await serper_service.search_forums(title, year, media_type)
-        results.extend(critic_results + reddit_results + forum_results)
-    except Exception as e:
-        logger.warning(f"Serper search failed: {e}")
+    results = critic_results + reddit_results + forum_results
     
     # Guardian
-    try:
-        guardian_articles = await guardian_service.search_film_reviews(title, year)
-        for article in guardian_articles:
-            results.append({
-                "title": article.headline,
-                "link": article.url,
-                "snippet": article.snippet,
-            })
-    except Exception as e:
-        logger.warning(f"Guardian search failed: {e}")
+    for article in guardian_articles:
+        results.append({
+            "title": article.headline,
+            "link": article.url,
+            "snippet": article.snippet,
+        })
     
     # NYT
-    try:
-        nyt_reviews = await nyt_service.search_reviews(title)
-        for review in nyt_reviews:
-            results.append({
-                "title": review.headline,
-                "link": review.url,
-                "snippet": review.summary,
-            })
-    except Exception as e:
-        logger.warning(f"NYT search failed: {e}")
+    for review in nyt_reviews:
+        results.append({
+            "title": review.headline,
+            "link": review.url,
+            "snippet": review.summary,
+        })
     
     return {
         "search_results": results,
@@ -326,22 +327,24 @@ async def enrich_data(state: AgentState) -> dict:
     omdb_scores = None
     trailer_url = None
     
-    # OMDB
-    try:
-        scores = await omdb_service.get_scores_by_title(
+    # OMDB + KinoCheck concurrently
+    scores, trailer_id = await asyncio.gather(
+        omdb_service.get_scores_by_title(
             title, year, "series" if movie.media_type == "tv" else "movie"
-        )
+        ),
+        kinocheck_service.get_trailer_by_tmdb_id(movie.tmdb_id, movie.media_type or "movie"),
+        return_exceptions=True,
+    )
+    
+    if isinstance(scores, Exception):
+        logger.warning(f"OMDB fetch failed: {scores}")
+    else:
         omdb_scores = scores.to_dict()
-    except Exception as e:
-        logger.warning(f"OMDB fetch failed: {e}")
     
-    # KinoCheck → TMDB fallback
-    try:
-        trailer_id = await kinocheck_service.get_trailer_by_tmdb_id(movie.tmdb_id, movie.media_type or "movie")
-        if trailer_id:
-            trailer_url = youtube_embed_url(trailer_id)
-    except Exception as e:
-        logger.warning(f"KinoCheck fetch failed: {e}")
+    if isinstance(trailer_id, Exception):
+        logger.warning(f"KinoCheck fetch failed: {trailer_id}")
+    elif trailer_id:
+        trailer_url = youtube_embed_url(trailer_id)
     
     # TMDB fallback for trailer
     if not trailer_url:
@@ -0,0 +1,119 @@
+"""
+Worth the Watch? — Response/Query Cache
+Small async key-value cache with per-key TTLs. Uses Redis when REDIS_URL is
+set, otherwise an in-process dict — fine for single-instance Koyeb deployment.
+Values are stored as orjson bytes, so anything orjson can dump can be cached.
+"""
+
+import time
+import logging
+from typing import Any, Optional
+import orjson
+from app.config import get_settings
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+# In-process fallback is bounded so it can't grow past the 512MB instance
+LOCAL_MAX_ENTRIES = 2048
+
+
+class CacheService:
+    def __init__(self):
+        self._redis = None
+        # {key: (expires_at, payload)}
+        self._local: dict[str, tuple[float, bytes]] = {}
+
+        if settings.REDIS_URL:
+            try:
+                import redis.asyncio as aioredis
+                self._redis = aioredis.from_url(settings.REDIS_URL)
+            except ImportError:
+                logger.warning("redis not installed, using in-process cache")
+
+    async def get(self, key: str) -> Optional[Any]:
+        """Return the cached value, or None on miss/expiry/backend error."""
+        if self._redis is not None:
+            try:
+                payload = await self._redis.get(key)
+            except Exception as e:
+                logger.warning(f"Cache get failed for {key}: {e}")
+                return None
+        else:
+            entry = self._local.get(key)
+            if entry is None:
+                return None
+            expires_at, payload = entry
+            if expires_at < time.monotonic():
+                self._local.pop(key, None)
+                return None
+
+        return orjson.loads(payload) if payload is not None else None
+
+    async def set(self, key: str, value: Any, ttl: int) -> None:
+        """Store `value` for `ttl` seconds. Failures are logged, never raised."""
+        try:
+            payload = orjson.dumps(value)
+        except TypeError as e:
+            logger.warning(f"Cache set skipped for {key}: {e}")
+            return
+
+        if self._redis is not None:
+            try:
+                await self._redis.set(key, payload, ex=ttl)
+            except Exception as e:
+                logger.warning(f"Cache set failed for {key}: {e}")
+            return
+
+        if len(self._local) >= LOCAL_MAX_ENTRIES:
+            self._evict()
+        self._local[key] = (time.monotonic() + ttl, payload)
+
+    async def delete(self, key: str) -> None:
+        if self._redis is not None:
+            try:
+                await self._redis.delete(key)
+            except Exception as e:
+                logger.warning(f"Cache delete failed for {key}: {e}")
+            return
+        self._local.pop(key, None)
+
+    async def delete_prefix(self, prefix: str) -> None:
+        """Drop every key starting with `prefix` (used for invalidation)."""
+        if self._redis is not None:
+            try:
+                keys = [k async for k in self._redis.scan_iter(match=f"{prefix}*")]
+                if keys:
+                    await self._redis.delete(*keys)
+            except Exception as e:
+                logger.warning(f"Cache delete_prefix failed for {prefix}: {e}")
+            return
+        for key in [k for k in self._local if k.startswith(prefix)]:
+            self._local.pop(key, None)
+
+    async def connect(self) -> None:
+        """Open the Redis pool at startup so the first request doesn't pay for it."""
+        if self._redis is None:
+            logger.info("🗄️ Cache: in-process")
+            return
+        try:
+            await self._redis.ping()
+            logger.info("🗄️ Cache: Redis connected")
+        except Exception as e:
+            logger.warning(f"Redis unreachable at startup, will retry per request: {e}")
+
+    async def close(self) -> None:
+        if self._redis is not None:
+            await self._redis.aclose()
+
+    def _evict(self) -> None:
+        """Drop expired entries; if still full, drop the oldest inserts."""
+        now = time.monotonic()
+        for key in [k for k, (exp, _) in self._local.items() if exp < now]:
+            del self._local[key]
+        while len(self._local) >= LOCAL_MAX_ENTRIES:
+            del self._local[next(iter(self._local))]
+
+
+# Singleton
+cache_service = CacheService()
@@ -29,6 +29,9 @@ def _build_deepseek_client():
     return None, None
 
 
+_EDGE_QUOTES = ('"', "'", "`")
+
+
 def sanitize_text(text: str) -> str:
     """Remove JSON artifacts and cleanup text."""
     if not text:
@@ -38,13 +41,21 @@ def sanitize_text(text: str) -> str:
     # Remove escaped quotes that might have slipped through double-encoding
     text = text.replace('\\"', '"').replace("\\'", "'")
     
-    # Recursively remove invalid starting/ending characters
-    while text and (text.startswith(('"', "'", "`")) or text.endswith(('"', "'", "`"))):
+    # Remove invalid starting/ending characters. One strip() takes off every
+    # leading/trailing quote and space at once, so no loop is needed.
+    if text.startswith(_EDGE_QUOTES) or text.endswith(_EDGE_QUOTES):
         text = text.strip(" \"'`")
         
     return text.strip()
 
 
+def sanitize_many(texts) -> list[str]:
+    """sanitize_text over a list of LLM strings (reasons, praise points, ...)."""
+    if not texts:
+        return []
+    return [sanitize_text(t) for t in texts]
+
+
 def _build_openai_client():
     if settings.OPENAI_API_KEY:
         return (
@@ -5,10 +5,11 @@ This is the core of the app.
 """
 
 import logging
-from datetime import date, datetime
+from datetime import datetime
 from typing import Optional
-from sqlalchemy import select
+from sqlalchemy import select, event
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
 import asyncio
 import unicodedata
 from urllib.parse import urlparse
@@ -19,6 +20,7 @@ from app.services.serper import serper_service
 from app.services.jina import jina_service
 from app.services.grep import extract_opinion_paragraphs, select_best_sources
 from app.services.llm import synthesize_review, llm_model
+from app.services.cache import cache_service
 from app.config import get_settings
 
 # Phase 2 imports
@@ -97,21 +99,12 @@ async def get_or_create_movie(db: AsyncSession, tmdb_id: int, media_type: str =
             normalized["poster_path"] = fallback_poster
             logger.info(f"✅ Fallback poster found: {fallback_poster}")
 
-    # Remove computed fields that aren't DB columns
+    # Remove computed fields — poster_url/backdrop_url are generated by the DB
     normalized.pop("poster_url", None)
     normalized.pop("backdrop_url", None)
     # normalized.pop("tmdb_vote_count", None)  <-- KEEP THIS NOW
     normalized.pop("original_title", None)
 
-    # Parse release_date string to date object before creating Movie
-    release_date_val = None
-    release_str = normalized.pop("release_date", None)
-    if release_str:
-        try:
-            release_date_val = date.fromisoformat(str(release_str))
-        except (ValueError, TypeError):
-            release_date_val = None
-
     # Re-check DB in case another request inserted while we were fetching from TMDB
     result = await db.execute(select(Movie).where(Movie.tmdb_id == tmdb_id))
     movie = result.scalar_one_or_none()
@@ -120,7 +113,8 @@ async def get_or_create_movie(db: AsyncSession, tmdb_id: int, media_type: str =
 
     # Try to insert, handle race condition gracefully
     try:
-        movie = Movie(**normalized, release_date=release_date_val)
+        # release_date is already a date (see tmdb.parse_iso_date)
+        movie = Movie(**normalized)
         db.add(movie)
         await db.flush()
         return movie
@@ -234,8 +228,102 @@ def calculate_confidence(
     return stats
 
 
+class JobProgress(dict):
+    """
+    Progress dict that wakes subscribers whenever a job's entry changes, so
+    SSE streams await updates instead of polling on a timer.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._events: dict[int, asyncio.Event] = {}
+
+    def __setitem__(self, tmdb_id, value):
+        super().__setitem__(tmdb_id, value)
+        self.notify(tmdb_id)
+
+    def pop(self, tmdb_id, *default):
+        value = super().pop(tmdb_id, *default)
+        self.notify(tmdb_id)
+        return value
+
+    def subscribe(self, tmdb_id: int) -> asyncio.Event:
+        """Event set on the next change for tmdb_id. Grab it before reading state."""
+        event = self._events.get(tmdb_id)
+        if event is None:
+            event = self._events[tmdb_id] = asyncio.Event()
+        return event
+
+    def notify(self, tmdb_id: int) -> None:
+        """Wake current subscribers; later ones get a fresh Event."""
+        event = self._events.pop(tmdb_id, None)
+        if event is not None:
+            event.set()
+
+
 # Global progress tracker: {tmdb_id: {"message": str, "percent": int}}
-job_progress = {}
+job_progress = JobProgress()
+
+
+# Review text beyond this is never shown to the battle LLM
+CONTEXT_EXCERPT_CHARS = 500
+
+
+def build_context_snippet(verdict: str, hook: Optional[str], review_text: Optional[str]) -> str:
+    """Review half of a movie's Versus battle prompt (see app.routers.versus)."""
+    snippet = f"Our Verdict: {verdict or ''}"
+    if hook:
+        snippet += f"\nHook: {hook}"
+    if review_text:
+        snippet += f"\nReview excerpt: {review_text[:CONTEXT_EXCERPT_CHARS]}"
+    return snippet
+
+
+def _apply_context_snippet(review: Review) -> None:
+    """Build the Versus prompt snippet once at write time instead of per battle."""
+    review.context_snippet = build_context_snippet(review.verdict, review.hook, review.review_text)
+
+
+# ─── Cache Invalidation ───────────────────────────────────
+# Review writes only flush; the caller commits later (background task,
+# cron batch, get_db). Dropping the caches at flush time lets a request
+# that lands in between read the old rows and re-cache them for the full
+# TTL, so the drop is deferred until the session's transaction commits.
+
+_STALE_CACHES_KEY = "stale_review_tmdb_ids"
+_invalidation_tasks: set[asyncio.Task] = set()
+
+
+def _invalidate_movie_caches(db: AsyncSession, tmdb_id: int) -> None:
+    """
+    Drop cached movie lists/details and tmdb_id's status poll once `db`
+    commits, so a new or refreshed review shows up.
+    """
+    db.sync_session.info.setdefault(_STALE_CACHES_KEY, set()).add(tmdb_id)
+
+
+async def _drop_movie_caches(tmdb_ids: set[int]) -> None:
+    await cache_service.delete_prefix("movies:")
+    # A cached "completed" status carries the review itself (see search.check_generation_status)
+    for tmdb_id in tmdb_ids:
+        await cache_service.delete(f"status:{tmdb_id}")
+
+
+@event.listens_for(Session, "after_commit")
+def _drop_caches_after_commit(session: Session) -> None:
+    tmdb_ids = session.info.pop(_STALE_CACHES_KEY, None)
+    if not tmdb_ids:
+        return
+    task = asyncio.get_running_loop().create_task(_drop_movie_caches(tmdb_ids))
+    _invalidation_tasks.add(task)
+    task.add_done_callback(_invalidation_tasks.discard)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_stale_marker(session: Session) -> None:
+    # Nothing was written, the cached rows are still current
+    session.info.pop(_STALE_CACHES_KEY, None)
+
 
 async def generate_review_for_movie(db: AsyncSession, movie: Movie) -> Review:
     """
@@ -371,6 +459,7 @@ async def generate_review_for_movie(db: AsyncSession, movie: Movie) -> Review:
                         llm_model=llm_model,
                     )
                     db.add(review)
+                _apply_context_snippet(review)
                 
                 # Apply OMDB scores if present
                 omdb = result.get("omdb_scores")
@@ -388,6 +477,7 @@ async def generate_review_for_movie(db: AsyncSession, movie: Movie) -> Review:
                 await db.flush()
                 
                 job_progress.pop(tmdb_id, None)
+                _invalidate_movie_caches(db, movie.tmdb_id)
                 logger.info(f"✅ LangGraph review complete: '{title}' → {review.verdict}")
                 return review
         except ImportError:
@@ -984,6 +1074,7 @@ CRITIC REVIEWS (Professional):
             llm_model=llm_model,
         )
         db.add(review)
+    _apply_context_snippet(review)
     
     await db.flush()
     
@@ -1027,6 +1118,7 @@ CRITIC REVIEWS (Professional):
         logger.warning(f"Final flush failed: {e}")
     
     job_progress.pop(tmdb_id, None)
+    _invalidate_movie_caches(db, movie.tmdb_id)
     return review
 
 
@@ -1096,6 +1188,8 @@ async def _create_fallback_review(db: AsyncSession, movie: Movie, genres: str) -
         best_quote=llm_output.best_quote,
         quote_source=llm_output.quote_source,
     )
+    _apply_context_snippet(review)
     db.add(review)
     await db.flush()
+    _invalidate_movie_caches(db, movie.tmdb_id)
     return review
\ No newline at end of file
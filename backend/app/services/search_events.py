@@ -0,0 +1,81 @@
+"""
+Worth the Watch? — Search Event Logger
+Buffers SearchEvent analytics rows in memory and writes them in batches,
+so a burst of searches costs one multi-row INSERT instead of one per search.
+"""
+
+import asyncio
+import logging
+from typing import Optional
+from sqlalchemy import insert
+from app.database import async_session
+from app.models import SearchEvent
+
+logger = logging.getLogger(__name__)
+
+# A batch is written once it has BATCH_MAX rows or FLUSH_INTERVAL seconds
+# have passed since its first row, whichever comes first
+FLUSH_INTERVAL = 0.5
+BATCH_MAX = 500
+# Analytics are best-effort: past this backlog new events are dropped
+QUEUE_MAX = 10_000
+
+
+class SearchEventLogger:
+    def __init__(self):
+        self._queue: asyncio.Queue[dict] = asyncio.Queue(maxsize=QUEUE_MAX)
+        self._task: Optional[asyncio.Task] = None
+
+    def log(self, query: str, ip_hash: str):
+        """Queue one event. Never blocks the request."""
+        try:
+            self._queue.put_nowait({"query": query, "ip_hash": ip_hash})
+        except asyncio.QueueFull:
+            logger.warning("Search event queue full, dropping event")
+
+    def start(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """Stop the worker and write whatever is still queued."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+        batch = []
+        while not self._queue.empty():
+            batch.append(self._queue.get_nowait())
+        if batch:
+            await self._flush(batch)
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + FLUSH_INTERVAL
+            while len(batch) < BATCH_MAX:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            await self._flush(batch)
+
+    async def _flush(self, batch: list[dict]):
+        try:
+            async with async_session() as session:
+                await session.execute(insert(SearchEvent), batch)
+                await session.commit()
+        except Exception as e:
+            logger.warning(f"Failed to write {len(batch)} search events: {e}")
+
+
+# Singleton
+search_event_logger = SearchEventLogger()
@@ -9,20 +9,66 @@ import httpx
 import asyncio
 import logging
 from datetime import date
-from typing import Optional
+from functools import lru_cache
+from typing import Optional, Sequence
 from app.config import get_settings
+from app.services.cache import cache_service
 from app.services.safety import is_safe_content
 from rapidfuzz import process, fuzz
 
 settings = get_settings()
 logger = logging.getLogger(__name__)
 
+# HTTP/2 needs the optional h2 package (httpx[http2]); fall back to HTTP/1.1
+try:
+    import h2  # noqa: F401
+    HTTP2_ENABLED = True
+except ImportError:
+    HTTP2_ENABLED = False
+
+# TMDB search results change slowly; cache them for 5 minutes
+SEARCH_CACHE_TTL = 300
+
+# Title details (release dates, runtime, genres) — refreshed daily
+DETAILS_CACHE_TTL = 24 * 60 * 60
+
+# Minimum WRatio score for a "Did you mean?" suggestion
+FUZZY_SCORE_CUTOFF = 85
+
+# Recently searched titles kept alongside the popular cache for "Did you mean?"
+RECENT_TITLES_MAX = 500
+
 TMDB_HEADERS = {
     "Authorization": f"Bearer {settings.TMDB_API_KEY}",
     "accept": "application/json",
 }
 
 
+@lru_cache(maxsize=4096)
+def _image_url(image_base: str, size: str, path: Optional[str]) -> Optional[str]:
+    """Build a TMDB image URL. Memoized — the same paths repeat on every page."""
+    if not path:
+        return None
+    if path.startswith("http"):
+        return path
+    return f"{image_base}/{size}{path}"
+
+
+def parse_iso_date(value) -> Optional[date]:
+    """
+    TMDB dates are always "YYYY-MM-DD" or "" — slice the digits instead of
+    going through a general parser. Anything malformed comes back as None.
+    """
+    if not value:
+        return None
+    if isinstance(value, date):
+        return value
+    try:
+        return date(int(value[0:4]), int(value[5:7]), int(value[8:10]))
+    except (ValueError, TypeError):
+        return None
+
+
 class TMDBService:
     def __init__(self):
         self.base = settings.TMDB_BASE_URL
@@ -30,7 +76,40 @@ class TMDBService:
         # Cache for "Did you mean?" fuzzy search
         # Stores tuples of (title, popularity)
         self.popular_titles_cache: list[tuple[str, float]] = []
+        self.popular_titles: list[str] = []
+        # Titles users actually found via search, oldest first (insertion-ordered set)
+        self.recent_titles: dict[str, None] = {}
         self._cache_lock = asyncio.Lock()
+        self._client: Optional[httpx.AsyncClient] = None
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """
+        Shared keep-alive client — reuses TCP/TLS connections to TMDB instead
+        of a fresh handshake per call. Created lazily so jobs and scripts
+        that use the service outside the app lifespan still work.
+        """
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                base_url=self.base,
+                headers=TMDB_HEADERS,
+                timeout=15,
+                limits=httpx.Limits(max_connections=100, max_keepalive_connections=20),
+                http2=HTTP2_ENABLED,
+            )
+        return self._client
+
+    async def aclose(self):
+        """Close the shared client (app shutdown)."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.aclose()
 
     async def _get(self, endpoint: str, params: dict = None) -> dict:
         """Make TMDB API request with error handling and retry."""
@@ -38,36 +117,31 @@ class TMDBService:
         
         for attempt in range(max_retries):
             try:
-                async with httpx.AsyncClient(timeout=15) as client:
-                    resp = await client.get(
-                        f"{self.base}{endpoint}",
-                        headers=TMDB_HEADERS,
-                        params=params or {},
-                    )
-                    
-                    if resp.status_code == 401:
-                        logger.critical("⚠️ TMDB API key is invalid!")
-                        return {}
-                    
-                    if resp.status_code == 404:
-                        logger.debug(f"TMDB 404: {endpoint}")
-                        return {}
-                    
-                    if resp.status_code == 429:
-                        logger.warning("TMDB rate limited, waiting 1s...")
+                resp = await self.client.get(endpoint, params=params or {})
+                
+                if resp.status_code == 401:
+                    logger.critical("⚠️ TMDB API key is invalid!")
+                    return {}
+                
+                if resp.status_code == 404:
+                    logger.debug(f"TMDB 404: {endpoint}")
+                    return {}
+                
+                if resp.status_code == 429:
+                    logger.warning("TMDB rate limited, waiting 1s...")
+                    await asyncio.sleep(1)
+                    continue
+                
+                if resp.status_code >= 500:
+                    if attempt < max_retries - 1:
                         await asyncio.sleep(1)
                         continue
-                    
-                    if resp.status_code >= 500:
-                        if attempt < max_retries - 1:
-                            await asyncio.sleep(1)
-                            continue
-                        logger.error(f"TMDB server error: {resp.status_code}")
-                        return {}
-                    
-                    resp.raise_for_status()
-                    return resp.json()
-                    
+                    logger.error(f"TMDB server error: {resp.status_code}")
+                    return {}
+                
+                resp.raise_for_status()
+                return resp.json()
+                
             except httpx.TimeoutException:
                 logger.warning(f"TMDB timeout: {endpoint}")
                 if attempt < max_retries - 1:
@@ -144,22 +218,34 @@ class TMDBService:
 
     async def get_movie_details(self, tmdb_id: int) -> dict:
         """Full movie details."""
-        return await self._get(f"/movie/{tmdb_id}")
+        return await self._get_details("movie", tmdb_id)
 
     async def get_tv_details(self, tmdb_id: int) -> dict:
         """Full TV show details."""
-        return await self._get(f"/tv/{tmdb_id}")
+        return await self._get_details("tv", tmdb_id)
+
+    async def _get_details(self, media_type: str, tmdb_id: int) -> dict:
+        """
+        Details cached for DETAILS_CACHE_TTL. The unreleased check in
+        trigger_generation and the generation job that follows it both
+        fetch the same title, and users click the same titles repeatedly.
+        """
+        cache_key = f"tmdb:details:{media_type}:{tmdb_id}"
+        cached = await cache_service.get(cache_key)
+        if cached is not None:
+            return cached
+
+        data = await self._get(f"/{media_type}/{tmdb_id}")
+        if data:
+            await cache_service.set(cache_key, data, ttl=DETAILS_CACHE_TTL)
+        return data
 
     async def get_movie_credits(self, movie_id: int) -> dict:
         """Get credits (cast + crew) for a movie."""
         try:
-            async with httpx.AsyncClient(timeout=10) as client:
-                resp = await client.get(
-                    f"{self.base}/movie/{movie_id}/credits",
-                    headers=TMDB_HEADERS,
-                )
-                if resp.status_code == 200:
-                    return resp.json()
+            resp = await self.client.get(f"/movie/{movie_id}/credits", timeout=10)
+            if resp.status_code == 200:
+                return resp.json()
         except Exception:
             pass
         return {}
@@ -167,18 +253,30 @@ class TMDBService:
     async def get_tv_credits(self, tv_id: int) -> dict:
         """Get credits (cast + crew) for a TV show."""
         try:
-            async with httpx.AsyncClient(timeout=10) as client:
-                resp = await client.get(
-                    f"{self.base}/tv/{tv_id}/aggregate_credits",
-                    headers=TMDB_HEADERS,
-                )
-                if resp.status_code == 200:
-                    return resp.json()
+            resp = await self.client.get(f"/tv/{tv_id}/aggregate_credits", timeout=10)
+            if resp.status_code == 200:
+                return resp.json()
         except Exception:
             pass
         return {}
 
     async def search(self, query: str, page: int = 1) -> list[dict]:
+        """
+        search_uncached, cached for SEARCH_CACHE_TTL. Autocomplete re-sends
+        the same prefixes on every keystroke, so keys are normalized to
+        lower/stripped. Empty results aren't cached — they may be a TMDB error.
+        """
+        cache_key = f"tmdb:search:{page}:{query.lower().strip()}"
+        cached = await cache_service.get(cache_key)
+        if cached is not None:
+            return cached
+
+        results = await self.search_uncached(query, page)
+        if results:
+            await cache_service.set(cache_key, results, ttl=SEARCH_CACHE_TTL)
+        return results
+
+    async def search_uncached(self, query: str, page: int = 1) -> list[dict]:
         """
         Multi-search with smart year detection.
         
@@ -322,18 +420,10 @@ class TMDBService:
         return videos
 
     def get_poster_url(self, path: Optional[str], size: str = "w500") -> Optional[str]:
-        if not path:
-            return None
-        if path.startswith("http"):
-            return path
-        return f"{self.image_base}/{size}{path}"
+        return _image_url(self.image_base, size, path)
 
     def get_backdrop_url(self, path: Optional[str], size: str = "w1280") -> Optional[str]:
-        if not path:
-            return None
-        if path.startswith("http"):
-            return path
-        return f"{self.image_base}/{size}{path}"
+        return _image_url(self.image_base, size, path)
 
     def normalize_result(self, item: dict) -> dict:
         """Normalize TMDB result to our schema."""
@@ -356,7 +446,7 @@ class TMDBService:
             "genres": item.get("genres") or [
                 {"id": gid} for gid in (item.get("genre_ids") or [])
             ],
-            "release_date": release,
+            "release_date": parse_iso_date(release),
             "tmdb_popularity": item.get("popularity"),
             "tmdb_vote_average": item.get("vote_average"),
             "tmdb_vote_count": item.get("vote_count"),
@@ -409,42 +499,59 @@ class TMDBService:
             
             async with self._cache_lock:
                 self.popular_titles_cache = list(unique_movies.values())
+                # Plain title list, matched directly by fuzzy_search
+                self.popular_titles = [t[0] for t in self.popular_titles_cache]
             
             logger.info(f"✅ Fuzzy cache warmed: {len(self.popular_titles_cache)} titles (Movies + TV) ready.")
             
         except Exception as e:
             logger.error(f"❌ Failed to warm up fuzzy cache: {e}")
 
-    async def fuzzy_search(self, query: str) -> Optional[dict]:
+    def remember_titles(self, results: list[dict]):
+        """Add titles from a successful search to the fuzzy-match pool."""
+        for m in results:
+            title = m.get("title") or m.get("name")
+            if not title:
+                continue
+            self.recent_titles.pop(title, None)
+            self.recent_titles[title] = None
+        while len(self.recent_titles) > RECENT_TITLES_MAX:
+            del self.recent_titles[next(iter(self.recent_titles))]
+
+    async def fuzzy_search(self, query: str, local_titles: Sequence[str] = ()) -> Optional[dict]:
         """
         Find a close match for a typo'd query using popular movie cache.
+        `local_titles` (titles already in our DB) are tried first and win ties.
         Returns: {"suggestion": "Correct Title", "results": [TMDB_Objects...]} or None
         """
-        if not self.popular_titles_cache or len(query) < 3:
+        if len(query) < 3:
             return None
 
-        # valid matches must be at least 85% similar to avoid junk
-        # extractOne returns (match, score, index)
-        # We search against just the titles
-        titles = [t[0] for t in self.popular_titles_cache]
-        
+        # valid matches must be at least 85% similar to avoid junk.
+        # score_cutoff lets rapidfuzz skip candidates early, and each pool is
+        # matched in place — no per-call concatenation of ~5k titles.
         # Use WRatio to handle punctuation/case/ordering better (e.g. "Monarch Legacy" vs "Monarch: Legacy")
-        match = process.extractOne(query, titles, scorer=fuzz.WRatio)
-        
-        if match:
-            best_title, score, idx = match
-            # Higher threshold for WRatio because it's looser
-            if score >= 85:
-                logger.info(f"🔍 Fuzzy match found: '{query}' -> '{best_title}' ({score}%)")
-                # Perform a real search for the corrected title
-                results = await self.search(best_title)
-                return {
-                    "suggestion": best_title,
-                    "results": results,
-                    "score": score
-                }
-        
-        return None
+        best_title, best_score = None, 0
+        for titles in (local_titles, self.popular_titles, self.recent_titles.keys()):
+            if not titles:
+                continue
+            match = process.extractOne(
+                query, titles, scorer=fuzz.WRatio,
+                score_cutoff=max(FUZZY_SCORE_CUTOFF, best_score + 0.01),
+            )
+            if match:
+                best_title, best_score, _ = match
+
+        if best_title is None:
+            return None
 
+        logger.info(f"🔍 Fuzzy match found: '{query}' -> '{best_title}' ({best_score}%)")
+        # Perform a real search for the corrected title
+        results = await self.search(best_title)
+        return {
+            "suggestion": best_title,
+            "results": results,
+            "score": best_score
+        }
 
 tmdb_service = TMDBService()
@@ -0,0 +1,25 @@
+import asyncio
+from sqlalchemy import text
+from app.database import async_session
+
+async def add_columns():
+    """Add the precomputed Versus prompt snippet to reviews."""
+    columns = [
+        "ALTER TABLE reviews ADD COLUMN IF NOT EXISTS context_snippet TEXT;",
+    ]
+
+    async with async_session() as session:
+        print("🚀 Starting migration...")
+        for col_sql in columns:
+            try:
+                print(f"Executing: {col_sql}")
+                await session.execute(text(col_sql))
+                await session.commit()
+            except Exception as e:
+                print(f"⚠️ Error (might already exist): {e}")
+                await session.rollback()
+        
+        print("✅ Migration complete!")
+
+if __name__ == "__main__":
+    asyncio.run(add_columns())
@@ -0,0 +1,32 @@
+import asyncio
+from sqlalchemy import text
+from app.database import async_session
+
+async def add_columns():
+    """Add generated poster_url/backdrop_url columns to movies (see models.Movie)."""
+    columns = [
+        "ALTER TABLE movies ADD COLUMN IF NOT EXISTS poster_url TEXT GENERATED ALWAYS AS ("
+        "CASE WHEN poster_path IS NULL OR poster_path = '' THEN NULL "
+        "WHEN poster_path LIKE 'http%' THEN poster_path "
+        "ELSE 'https://image.tmdb.org/t/p/w500' || poster_path END) STORED;",
+        "ALTER TABLE movies ADD COLUMN IF NOT EXISTS backdrop_url TEXT GENERATED ALWAYS AS ("
+        "CASE WHEN backdrop_path IS NULL OR backdrop_path = '' THEN NULL "
+        "WHEN backdrop_path LIKE 'http%' THEN backdrop_path "
+        "ELSE 'https://image.tmdb.org/t/p/w1280' || backdrop_path END) STORED;",
+    ]
+
+    async with async_session() as session:
+        print("🚀 Starting migration...")
+        for col_sql in columns:
+            try:
+                print(f"Executing: {col_sql}")
+                await session.execute(text(col_sql))
+                await session.commit()
+            except Exception as e:
+                print(f"⚠️ Error (might already exist): {e}")
+                await session.rollback()
+
+        print("✅ Migration complete!")
+
+if __name__ == "__main__":
+    asyncio.run(add_columns())
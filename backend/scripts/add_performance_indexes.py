@@ -0,0 +1,35 @@
+import asyncio
+from sqlalchemy import text
+from app.database import async_session
+
+async def add_indexes():
+    """Add query-performance indexes to existing tables (create_all skips them)."""
+    statements = [
+        # /random — partial indexes over the rows it can actually pick
+        "CREATE INDEX IF NOT EXISTS idx_movies_has_poster_low_pop ON movies (tmdb_popularity) WHERE poster_path IS NOT NULL;",
+        "CREATE INDEX IF NOT EXISTS idx_reviews_worth_movie ON reviews (movie_id) WHERE verdict = 'WORTH IT';",
+        # Title search — substring LIKE on lower(title)
+        "CREATE EXTENSION IF NOT EXISTS pg_trgm;",
+        "CREATE INDEX IF NOT EXISTS movies_title_trgm ON movies USING GIN (lower(title) gin_trgm_ops);",
+        # Status polling + quick_search — tmdb_id -> (id, poster_path) answered
+        # by an index-only scan. Supersedes the id-only movies_tmdb_id_covering.
+        # reviews.movie_id is already covered by its UNIQUE constraint index.
+        "DROP INDEX IF EXISTS movies_tmdb_id_covering;",
+        "CREATE INDEX IF NOT EXISTS movies_tmdb_cover ON movies (tmdb_id) INCLUDE (id, poster_path);",
+    ]
+
+    async with async_session() as session:
+        print("🚀 Starting migration...")
+        for sql in statements:
+            try:
+                print(f"Executing: {sql}")
+                await session.execute(text(sql))
+                await session.commit()
+            except Exception as e:
+                print(f"⚠️ Error: {e}")
+                await session.rollback()
+
+        print("✅ Migration complete!")
+
+if __name__ == "__main__":
+    asyncio.run(add_indexes())